@@ -0,0 +1,212 @@
+from abc import abstractmethod
+from numpy import arange, argmax, argsort, asarray, concatenate, full, isnan, nan, nonzero, packbits, uint8, unpackbits, vstack, where
+from numpy.random import randint, random
+from Solid.GeneticAlgorithm import GeneticAlgorithm
+from Solid.ParallelEvaluator import HookTask
+
+
+class ArrayGeneticAlgorithm(GeneticAlgorithm):
+    """
+    Conducts genetic algorithm on a population stored as a single numpy matrix of bits,
+    with crossover and mutation applied to the whole population at once
+    """
+    timed_hooks = ('_fitness', '_fitness_batch', 'selection', '_crossover_batch', '_mutate_batch')
+
+    crossover = None
+    packed = None
+    genome_size = None
+
+    def __init__(self, crossover_rate, mutation_rate, max_steps, max_fitness=None,
+                 cache_size=None, cache_key=None, selection='roulette', tournament_size=2,
+                 crossover='one_point', packed=False):
+        """
+
+        :param crossover_rate: probability of crossover
+        :param mutation_rate: probability of mutation
+        :param max_steps: maximum steps to run genetic algorithm for
+        :param max_fitness: fitness value to stop algorithm once reached
+        :param cache_size: number of fitness values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param selection: 'roulette', 'stochastic_universal', 'tournament' or 'rank' selection
+        :param tournament_size: number of members competing in each tournament of tournament selection
+        :param crossover: 'one_point' or 'uniform' crossover
+        :param packed: indicates whether or not to store eight genes per byte
+        """
+        GeneticAlgorithm.__init__(self, crossover_rate, mutation_rate, max_steps, max_fitness,
+                                  cache_size, cache_key, selection, tournament_size)
+
+        if crossover in ('one_point', 'uniform'):
+            self.crossover = crossover
+        else:
+            raise ValueError('Crossover must be either "one_point" or "uniform"')
+
+        self.packed = bool(packed)
+
+    @abstractmethod
+    def _initial_population(self):
+        """
+        Generates initial population -
+        members must be rows of a 2D array-like of binary-valued integers
+
+        :return: matrix with one member per row
+        """
+        pass
+
+    def _member(self, row):
+        """
+        Converts a stored row of the population matrix to a member
+
+        :param row: a row of self.population
+        :return: member as a 1D uint8 array of binary values
+        """
+        if self.packed:
+            return unpackbits(row)[:self.genome_size]
+        return row.copy()
+
+    def _evaluate_row(self, row):
+        """
+        Evaluates fitness of a stored row of the population matrix
+
+        :param row: a row of self.population
+        :return: fitness of member
+        """
+        return self._fitness(self._member(row))
+
+    def _fitness_batch(self, population):
+        """
+        Evaluates fitness of rows of the population matrix - override with a vectorized
+        implementation to replace the per-member calls to _fitness. Rows are packed
+        with numpy.packbits when the packed option is set
+
+        :param population: matrix of stored members
+        :return: sequence of fitnesses, in the same order as population
+        """
+        if self.evaluator is not None and self.evaluator.parallel:
+            return self.evaluator.map(population)
+        return [self._evaluate_row(x) for x in population]
+
+    def _task(self):
+        """
+        Returns the function of a single stored row that workers evaluate
+
+        :return: picklable function of a single row
+        """
+        return HookTask(self, '_evaluate_row', '_fitness')
+
+    def _populate_fitness(self):
+        """
+        Calculates fitness of members of current population whose fitness is unknown -
+        new and mutated members are marked by nan in self.fitnesses
+
+        :return: None
+        """
+        if self.fitnesses is None or len(self.fitnesses) != len(self.population):
+            self.fitnesses = full(len(self.population), nan)
+        dirty = nonzero(isnan(self.fitnesses))[0]
+        if len(dirty):
+            self.fitnesses[dirty] = asarray(self._fitness_batch(self.population[dirty]), dtype=float)
+
+    def _crossover_batch(self, parents1, parents2):
+        """
+        Creates one child per pair of parent rows
+
+        :param parents1: matrix of stored members
+        :param parents2: matrix of stored members
+        :return: matrix of children
+        """
+        n, width = parents1.shape
+        if self.crossover == 'uniform':
+            if self.packed:
+                mask = randint(0, 256, (n, width)).astype(uint8)
+                return (parents1 & mask) | (parents2 & ~mask)
+            return where(randint(0, 2, (n, width)).astype(bool), parents1, parents2)
+        points = randint(0, self.genome_size, n)
+        if self.packed:
+            cols = arange(width)
+            mask = where(cols < (points // 8)[:, None], 255, 0)
+            mask = where(cols == (points // 8)[:, None], ((0xFF00 >> (points % 8)) & 0xFF)[:, None], mask)
+            mask = mask.astype(uint8)
+            return (parents1 & mask) | (parents2 & ~mask)
+        return where(arange(width) < points[:, None], parents1, parents2)
+
+    def _mutate_batch(self, population):
+        """
+        Flips one random bit in each member with probability equal to the mutation rate, in place
+
+        :param population: matrix of stored members
+        :return: boolean array indicating which rows were mutated
+        """
+        mutated = self.mutation_rate >= random(len(population))
+        rows = nonzero(mutated)[0]
+        bits = randint(0, self.genome_size, len(rows))
+        if self.packed:
+            population[rows, bits // 8] ^= (128 >> (bits % 8)).astype(uint8)
+        else:
+            population[rows, bits] ^= 1
+        return mutated
+
+    def _initialize(self):
+        """
+        Generates, stores and evaluates the initial population
+
+        :return: None
+        """
+        population = asarray(self._initial_population(), dtype=uint8)
+        self.genome_size = population.shape[1]
+        self.population = packbits(population, axis=1) if self.packed else population
+        self._populate_fitness()
+        best_member, self.best_fitness = self._most_fit()
+        self.best_member = self._member(best_member)
+
+    def _step(self):
+        """
+        Advances the population by one generation and updates the best member
+
+        :return: None
+        """
+        num_copy = max(int((1 - self.crossover_rate) * len(self.population)), 2)
+        num_crossover = len(self.population) - num_copy
+
+        survivors = self.selection(self.fitnesses, num_copy)
+        fitnesses = self.fitnesses[survivors]
+        parents = self.selection(fitnesses, 2 * num_crossover)
+        children = self._crossover_batch(self.population[survivors[parents[:num_crossover]]],
+                                         self.population[survivors[parents[num_crossover:]]])
+
+        self.population = vstack((self.population[survivors], children))
+        self.fitnesses = concatenate((fitnesses, full(num_crossover, nan)))
+        self.fitnesses[self._mutate_batch(self.population)] = nan
+        self._populate_fitness()
+
+        best_member, best_fitness = self._most_fit()
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.best_member = self._member(best_member)
+
+    def _emigrants(self, n):
+        """
+        Returns copies of the n most fit stored rows of current population
+
+        :param n: number of members
+        :return: matrix of stored members and array of their fitnesses
+        """
+        idx = argsort(-self.fitnesses, kind='stable')[:n]
+        return self.population[idx], self.fitnesses[idx]
+
+    def _immigrate(self, members, fitnesses):
+        """
+        Replaces the least fit rows of current population with already evaluated stored rows
+
+        :param members: stored members
+        :param fitnesses: fitnesses of members
+        :return: None
+        """
+        if len(members) == 0:
+            return
+        fitnesses = asarray(fitnesses, dtype=float)
+        idx = argsort(self.fitnesses, kind='stable')[:len(members)]
+        self.population[idx] = asarray(members, dtype=uint8)[:len(idx)]
+        self.fitnesses[idx] = fitnesses[:len(idx)]
+        if fitnesses.max() > self.best_fitness:
+            self.best_fitness = fitnesses.max()
+            self.best_member = self._member(asarray(members, dtype=uint8)[argmax(fitnesses)])
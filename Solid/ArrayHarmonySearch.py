@@ -0,0 +1,89 @@
+from numpy import arange, asarray, where
+from numpy.random import randint, random, uniform
+from Solid.HarmonySearch import HarmonySearch
+
+
+class ArrayHarmonySearch(HarmonySearch):
+    """
+    Conducts harmony search on a memory stored as a single numpy matrix, improvising
+    a batch of harmonies at once with vectorized memory consideration and pitch adjustment
+    """
+    batch_size = None
+
+    def __init__(self, hms, hmcr, par, fw, max_steps, max_score=None,
+                 cache_size=None, cache_key=None, bounds=None, batch_size=1):
+        """
+
+        :param hms: harmony memory size
+        :param hmcr: harmony memory considering rate
+        :param par: pitch adjustment rate
+        :param fw: fret width
+        :param max_steps: maximum number of steps to run algorithm for
+        :param max_score: objective function value to stop algorithm once reached
+        :param cache_size: number of score values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param bounds: list of (low, high) pairs, one per component, to draw random components from uniformly
+        :param batch_size: number of harmonies improvised and scored per step
+        """
+        HarmonySearch.__init__(self, hms, hmcr, par, fw, max_steps, max_score, cache_size, cache_key, bounds)
+
+        if isinstance(batch_size, int) and batch_size > 0:
+            self.batch_size = batch_size
+        else:
+            raise TypeError('Batch size must be a positive integer')
+
+    def _clear(self):
+        """
+        Resets the variables that are altered on a per-run basis of the algorithm
+
+        :return: None
+        """
+        HarmonySearch._clear(self)
+        self.memory = asarray(self.memory, dtype=float)
+
+    def _random_batch(self, n):
+        """
+        Generates n random harmonies, in a single draw when bounds are declared
+
+        :param n: number of harmonies
+        :return: matrix with one harmony per row
+        """
+        if self.bounds is not None:
+            return uniform(self._lows, self._highs, (n, len(self.bounds)))
+        return asarray([self._random_harmony() for _ in range(n)], dtype=float)
+
+    def _score_batch(self, harmonies):
+        """
+        Returns scores of rows of a matrix of harmonies - override with a vectorized
+        implementation to replace the per-harmony calls to _score
+
+        :param harmonies: matrix with one harmony per row
+        :return: sequence of scores, where ith score belongs to ith row
+        """
+        return asarray([self._score(x) for x in harmonies], dtype=float)
+
+    def _improvise(self):
+        """
+        Improvises a batch of harmonies, drawing each component from a random harmony in memory,
+        pitch adjusted, or from a random harmony
+
+        :return: matrix with one harmony per row
+        """
+        hms, width = self.memory.shape
+        res = self.memory[randint(0, hms, (self.batch_size, width)), arange(width)]
+        res += where(random((self.batch_size, width)) < self.par,
+                     uniform(-1, 1, (self.batch_size, width)) * self.fw, 0.)
+        considered = random((self.batch_size, width)) < self.hmcr
+        if not considered.all():
+            res = where(considered, res, self._random_batch(self.batch_size))
+        return res
+
+    def _step(self):
+        """
+        Improvises and scores a batch of harmonies, keeping each that beats the worst harmony in memory
+
+        :return: None
+        """
+        batch = self._improvise()
+        for harmony, score in zip(batch, self._score_batch(batch)):
+            self._replace_worst(harmony, score)
@@ -0,0 +1,169 @@
+from abc import abstractmethod
+from numpy import argmin, asarray, exp, maximum
+from numpy.random import random
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.RunStats import RunStats
+from Solid.SimulatedAnnealing import SimulatedAnnealing
+
+
+class ArraySimulatedAnnealing(SimulatedAnnealing):
+    """
+    Conducts many independent simulated annealing chains at once, storing the state of each
+    chain as a row of a single numpy matrix and accepting or rejecting all neighbors in one step
+    """
+    timed_hooks = ('_neighbor_batch', '_energy', '_energy_batch', 'adjust_temp')
+
+    best_states = None
+    best_energies = None
+
+    def __init__(self, initial_state, temp_begin, schedule_constant, max_steps,
+                 min_energy=None, schedule='exponential', cache_size=None, cache_key=None, reheat_steps=None):
+        """
+
+        :param initial_state: matrix of initial states, one chain per row
+        :param max_steps: maximum number of iterations to conduct annealing for
+        :param temp_begin: beginning temperature, or 'auto' to estimate it from sampled energy deltas
+        :param schedule_constant: constant value in annealing schedule function
+        :param min_energy: energy value to stop algorithm once reached by any chain
+        :param schedule: 'exponential', 'linear', 'lundy_mees', 'logarithmic' or 'adaptive' annealing schedule
+        :param cache_size: number of energy values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param reheat_steps: number of steps without improving the best energy across chains after which
+                             the temperature is reset to the one at which it last improved, None disables reheating
+        """
+        SimulatedAnnealing.__init__(self, asarray(initial_state), temp_begin, schedule_constant, max_steps,
+                                    min_energy, schedule, cache_size, cache_key, copy='array',
+                                    reheat_steps=reheat_steps)
+
+        if self.initial_state.ndim != 2:
+            raise ValueError('Initial state must be a matrix with one chain per row')
+
+    def _clear(self):
+        """
+        Resets the variables that are altered on a per-run basis of the algorithm
+
+        :return: None
+        """
+        SimulatedAnnealing._clear(self)
+        self.best_states = None
+        self.best_energies = None
+
+    @abstractmethod
+    def _neighbor_batch(self):
+        """
+        Returns a random neighbor of the current state of every chain
+
+        :return: matrix of neighbors, where ith row is a neighbor of self.current_state[i]
+        """
+        pass
+
+    def _energy_batch(self, states):
+        """
+        Finds the energy of every row of a matrix of states - override with a vectorized
+        implementation to replace the per-row calls to _energy
+
+        :param states: matrix of states
+        :return: array of energies, where ith energy belongs to ith row
+        """
+        return asarray([self._energy(x) for x in states], dtype=float)
+
+    def _sample_deltas(self, n):
+        """
+        Samples energy changes of random transitions from the current states, one batch of neighbors at a time
+
+        :param n: minimum number of transitions to sample
+        :return: array of energy changes
+        """
+        res = []
+        while len(res) < n:
+            res.extend(asarray(self._energy_batch(asarray(self._neighbor_batch())), dtype=float) - self.current_energy)
+        return res
+
+    def _initialize(self):
+        """
+        Starts every chain from its row of the initial state at the starting temperature
+
+        :return: None
+        """
+        self.current_state = self.initial_state.copy()
+        self.current_energy = asarray(self._energy_batch(self.current_state), dtype=float)
+        self.best_states = self.current_state.copy()
+        self.best_energies = self.current_energy.copy()
+        self._global_best()
+        self.current_temp = self._initial_temp()
+
+    def _global_best(self):
+        """
+        Updates the best state and energy across all chains
+
+        :return: None
+        """
+        i = argmin(self.best_energies)
+        self.best_state = self.best_states[i].copy()
+        self.best_energy = float(self.best_energies[i])
+
+    def _step(self):
+        """
+        Proposes a neighbor for every chain and accepts each by the Metropolis criterion
+        at the current temperature, then updates the best state of every chain and the
+        acceptance rate averaged over chains
+
+        :return: None
+        """
+        neighbors = asarray(self._neighbor_batch())
+        energies = asarray(self._energy_batch(neighbors), dtype=float)
+        delta = energies - self.current_energy
+        accepted = random(len(delta)) < exp(-maximum(delta, 0) / self.current_temp)
+        self.current_state[accepted] = neighbors[accepted]
+        self.current_energy[accepted] = energies[accepted]
+        self.acceptance_rate += (accepted.mean() - self.acceptance_rate) / 500.
+
+        best_energy = self.best_energy
+        improved = self.current_energy < self.best_energies
+        if improved.any():
+            self.best_states[improved] = self.current_state[improved]
+            self.best_energies[improved] = self.current_energy[improved]
+            self._global_best()
+        if self.best_energy < best_energy:
+            self.stagnant_steps = 0
+            self.reheat_temp = self.current_temp
+        else:
+            self.stagnant_steps += 1
+
+    def run(self, verbose=True, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        """
+        Conducts simulated annealing on every chain
+
+        :param verbose: indicates whether or not to print progress regularly
+        :param max_evaluations: maximum number of energy evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
+        :return: best state across all chains and its energy
+        """
+        self._clear()
+        with Budget(self, ['_energy'], ['_energy_batch'], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._initialize()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if verbose and ((i + 1) % 100 == 0):
+                        print(self)
+
+                    self._step()
+
+                    if self.min_energy is not None and self.best_energy < self.min_energy:
+                        print("TERMINATING - REACHED MINIMUM ENERGY")
+                        return self.best_state, self.best_energy
+
+                    self.adjust_temp()
+                    if self.current_temp < 0.000001:
+                        print("TERMINATING - REACHED TEMPERATURE OF 0")
+                        return self.best_state, self.best_energy
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+                return self.best_state, self.best_energy
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
+                return self.best_state, self.best_energy
@@ -0,0 +1,167 @@
+from time import perf_counter
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised before an evaluation that would exceed the evaluation or time budget of a run
+    """
+    pass
+
+
+class _Counted:
+    """
+    Wraps an evaluation hook so that each evaluation is charged to a budget - calls made from
+    within another counted call are not charged again, and a batch is charged through the single
+    member calls it makes, or per member when it makes none, as vectorized batch hooks do. A batch
+    mapped on the owner's parallel evaluator is charged per member before it runs, since pool
+    threads would otherwise race on the shared flag and the cache counters
+    """
+    budget = None
+    func = None
+    batch = None
+
+    def __init__(self, budget, func, batch):
+        self.budget = budget
+        self.func = func
+        self.batch = batch
+
+    def __call__(self, *args):
+        budget = self.budget
+        if budget.active:
+            return self.func(*args)
+        n = 1
+        if self.batch:
+            n = len(args[0])
+            evaluator = getattr(budget.owner, 'evaluator', None)
+            if evaluator is None or not evaluator.parallel:
+                budget.check(n)
+                reached = budget.reached()
+                res = self.func(*args)
+                if budget.reached() == reached:
+                    budget.evaluations += n
+                return res
+        budget.charge(n)
+        budget.active = True
+        try:
+            return self.func(*args)
+        finally:
+            budget.active = False
+
+
+class Budget:
+    """
+    Counts and limits the number of evaluations and the wall-clock time of a run by wrapping
+    the evaluation hooks of an optimizer for the duration of a with block - a hook memoized by
+    the optimizer's cache is wrapped inside the cache, so cache hits are not charged. A batch
+    that could exceed the remaining evaluations is refused whole, before any member is evaluated,
+    and a first batch larger than the whole budget is rejected as an invalid budget
+    """
+    owner = None
+    hooks = None
+    batch_hooks = None
+
+    max_evaluations = None
+    time_limit = None
+    count = None
+
+    evaluations = None
+    start_time = None
+    active = None
+
+    def __init__(self, owner, hooks, batch_hooks, max_evaluations=None, time_limit=None, count=False):
+        """
+
+        :param owner: optimizer whose hooks are wrapped
+        :param hooks: names of hooks evaluating a single member, charged one evaluation per call
+        :param batch_hooks: names of hooks evaluating a sequence of members, charged one evaluation per member
+                            unless they evaluate members through a single member hook
+        :param max_evaluations: maximum number of evaluations, None for no limit
+        :param time_limit: maximum number of seconds, None for no limit
+        :param count: indicates whether or not to count evaluations even without a limit
+        """
+        if max_evaluations is not None and not (isinstance(max_evaluations, int) and max_evaluations > 0):
+            raise ValueError('Maximum evaluations must be a positive integer')
+
+        if time_limit is not None and not (isinstance(time_limit, (int, float)) and time_limit > 0):
+            raise ValueError('Time limit must be a positive number')
+
+        self.owner = owner
+        self.hooks = list(hooks)
+        self.batch_hooks = list(batch_hooks)
+        self.max_evaluations = max_evaluations
+        self.time_limit = None if time_limit is None else float(time_limit)
+        self.count = bool(count) or max_evaluations is not None or time_limit is not None
+        self.evaluations = 0
+        self.active = False
+        self._saved = []
+
+    def __enter__(self):
+        self.evaluations = 0
+        self.active = False
+        self.start_time = perf_counter()
+        if self.count:
+            cache = getattr(self.owner, 'cache', None)
+            for names, batch in [(self.hooks, False), (self.batch_hooks, True)]:
+                for name in names:
+                    target = self.owner
+                    if not batch and cache is not None and self.owner.__dict__.get(name) is cache:
+                        target, name = cache, 'func'
+                    self._saved.append((target, name, target.__dict__.get(name)))
+                    setattr(target, name, _Counted(self, getattr(target, name), batch))
+        return self
+
+    def __exit__(self, *args):
+        for target, name, hook in reversed(self._saved):
+            if hook is None:
+                delattr(target, name)
+            else:
+                setattr(target, name, hook)
+        self._saved = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_saved'] = []
+        return state
+
+    def elapsed(self):
+        """
+        Returns seconds since the budget was entered
+
+        :return: elapsed wall-clock time
+        """
+        return perf_counter() - self.start_time
+
+    def reached(self):
+        """
+        Returns the number of calls that have reached a counted single member hook, including
+        those answered by the owner's cache
+
+        :return: number of counted evaluations and cache hits
+        """
+        cache = getattr(self.owner, 'cache', None)
+        return self.evaluations + (0 if cache is None else cache.hits)
+
+    def check(self, n):
+        """
+        Raises if n more evaluations would exceed the budget - ValueError if they are the first
+        evaluations of the run, as the run could never evaluate them, else BudgetExhausted
+
+        :param n: number of evaluations
+        :return: None
+        """
+        if self.max_evaluations is not None and self.evaluations + n > self.max_evaluations:
+            if self.evaluations == 0:
+                raise ValueError('Maximum evaluations must be at least %d to evaluate the first batch' % n)
+            raise BudgetExhausted('REACHED MAXIMUM EVALUATIONS')
+        if self.time_limit is not None and perf_counter() - self.start_time > self.time_limit:
+            raise BudgetExhausted('REACHED TIME LIMIT')
+
+    def charge(self, n):
+        """
+        Counts n evaluations about to be made, raising if they would exceed the budget
+
+        :param n: number of evaluations
+        :return: None
+        """
+        self.check(n)
+        self.evaluations += n
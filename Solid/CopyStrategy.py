@@ -0,0 +1,40 @@
+from copy import copy, deepcopy
+
+
+def _copy_array(member):
+    """
+    Copies a member through its own copy method, as for numpy arrays
+
+    :param member: a member
+    :return: copy of member
+    """
+    return member.copy()
+
+
+def _copy_none(member):
+    """
+    Returns an immutable member as is
+
+    :param member: a member
+    :return: member
+    """
+    return member
+
+
+def get_copy_strategy(copy_str):
+    """
+    Returns the function used to copy members for a copy strategy name
+
+    :param copy_str: 'deepcopy', 'shallow', 'array' or 'none'
+    :return: function of a single member returning its copy
+    """
+    if copy_str == 'deepcopy':
+        return deepcopy
+    elif copy_str == 'shallow':
+        return copy
+    elif copy_str == 'array':
+        return _copy_array
+    elif copy_str == 'none':
+        return _copy_none
+    else:
+        raise ValueError('Copy strategy must be "deepcopy", "shallow", "array" or "none"')
@@ -1,6 +1,12 @@
 from abc import ABCMeta, abstractmethod
-from copy import deepcopy
-from random import randint, random, shuffle
+from functools import partial
+from random import randint, random
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.CopyStrategy import get_copy_strategy
+from Solid.MemoCache import MemoCache
+from Solid.ParallelEvaluator import HookTask, ParallelEvaluator
+from Solid.RunStats import RunStats
+from Solid.Selection import rank, roulette, stochastic_universal, tournament
 
 
 class GeneticAlgorithm:
@@ -15,6 +21,9 @@ class GeneticAlgorithm:
     crossover_rate = None
 
     mutation_rate = None
+    mutated = None
+
+    selection = None
 
     cur_steps = None
     best_fitness = None
@@ -23,13 +32,41 @@ class GeneticAlgorithm:
     max_steps = None
     max_fitness = None
 
-    def __init__(self, crossover_rate, mutation_rate, max_steps, max_fitness=None):
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_fitness', '_fitness_batch', 'selection', '_select_n', '_crossover', '_mutate', '_copy')
+    run_state = ('population', 'fitnesses')
+    copy_strategy = None
+    evaluator = None
+
+    def _get_selection(self, selection_str, tournament_size):
+        if selection_str == 'roulette':
+            return roulette
+        elif selection_str == 'stochastic_universal':
+            return stochastic_universal
+        elif selection_str == 'tournament':
+            if isinstance(tournament_size, int) and tournament_size > 0:
+                return partial(tournament, size=tournament_size)
+            raise ValueError('Tournament size must be a positive integer')
+        elif selection_str == 'rank':
+            return rank
+        else:
+            raise ValueError('Selection must be "roulette", "stochastic_universal", "tournament" or "rank"')
+
+    def __init__(self, crossover_rate, mutation_rate, max_steps, max_fitness=None,
+                 cache_size=None, cache_key=None, selection='roulette', tournament_size=2, copy='deepcopy'):
         """
 
         :param crossover_rate: probability of crossover
         :param mutation_rate: probability of mutation
         :param max_steps: maximum steps to run genetic algorithm for
         :param max_fitness: fitness value to stop algorithm once reached
+        :param cache_size: number of fitness values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param selection: 'roulette', 'stochastic_universal', 'tournament' or 'rank' selection
+        :param tournament_size: number of members competing in each tournament of tournament selection
+        :param copy: 'deepcopy', 'shallow', 'array' or 'none' strategy used to copy members
         """
         if isinstance(crossover_rate, float):
             if 0 <= crossover_rate <= 1:
@@ -58,6 +95,14 @@ class GeneticAlgorithm:
             else:
                 raise ValueError('Maximum fitness must be a numeric type')
 
+        self.selection = self._get_selection(selection, tournament_size)
+
+        self.copy_strategy = get_copy_strategy(copy)
+
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._fitness, self), cache_size, cache_key)
+            self._fitness = self.cache
+
     def __str__(self):
         return ('GENETIC ALGORITHM: \n' +
                 'CURRENT STEPS: %d \n' +
@@ -100,13 +145,31 @@ class GeneticAlgorithm:
         """
         pass
 
+    def _fitness_batch(self, population):
+        """
+        Evaluates fitness of a list of members - override with a vectorized
+        implementation to replace the per-member calls to _fitness
+
+        :param population: list of members
+        :return: sequence of fitnesses, in the same order as population
+        """
+        if self.evaluator is not None and self.evaluator.parallel:
+            return self.evaluator.map(population)
+        return [self._fitness(x) for x in population]
+
     def _populate_fitness(self):
         """
-        Calculates fitness of all members of current population
+        Calculates fitness of members of current population whose fitness is unknown -
+        new and mutated members are marked by None in self.fitnesses
 
         :return: None
         """
-        self.fitnesses = list([self._fitness(x) for x in self.population])
+        if self.fitnesses is None or len(self.fitnesses) != len(self.population):
+            self.fitnesses = [None] * len(self.population)
+        dirty = list([i for i, x in enumerate(self.fitnesses) if x is None])
+        if dirty:
+            for i, x in zip(dirty, self._fitness_batch(list([self.population[i] for i in dirty]))):
+                self.fitnesses[i] = x
 
     def _most_fit(self):
         """
@@ -122,30 +185,41 @@ class GeneticAlgorithm:
             cur_idx += 1
         return self.population[best_idx], self.fitnesses[best_idx]
 
+    def _copy(self, member):
+        """
+        Copies a member using the copy strategy chosen in the constructor -
+        override with a faster copy for large members
+
+        :param member: a member
+        :return: copy of member
+        """
+        return self.copy_strategy(member)
+
+    def _take(self, indices):
+        """
+        Builds a new population from members of the current population at the given indices -
+        since the current population is discarded, only members taken more than once are copied
+
+        :param indices: indices of members to take
+        :return: list of members
+        """
+        taken = set()
+        res = []
+        for i in indices:
+            res.append(self._copy(self.population[i]) if i in taken else self.population[i])
+            taken.add(i)
+        return res
+
     def _select_n(self, n):
         """
         Probabilistically selects n members from current population using
-        roulette-wheel selection
+        the selection scheme chosen in the constructor - relies on self.fitnesses
+        being up to date with self.population
 
         :param n: number of members to select
         :return: n members
         """
-        shuffle(self.population)
-        total_fitness = sum(self.fitnesses)
-        if total_fitness != 0:
-            probs = list([self._fitness(x) / total_fitness for x in self.population])
-        else:
-            return self.population[0:n]
-        res = []
-        for _ in range(n):
-            r = random()
-            sum_ = 0
-            for i, x in enumerate(probs):
-                sum_ += probs[i]
-                if r <= sum_:
-                    res.append(deepcopy(self.population[i]))
-                    break
-        return res
+        return list([self._copy(self.population[i]) for i in self.selection(self.fitnesses, n)])
 
     def _crossover(self, parent1, parent2):
         """
@@ -160,52 +234,148 @@ class GeneticAlgorithm:
 
     def _mutate(self, member):
         """
-        Randomly mutates a member
+        Randomly mutates a member, recording in self.mutated whether or not it changed
 
         :param member: a member
         :return: mutated member
         """
-        if self.mutation_rate >= random():
-            idx = randint(0, len(member) - 1)
-            member[idx] = 1 if member[idx] == 0 else 1
+        self.mutated = self.mutation_rate >= random()
+        if self.mutated:
+            self._mutate_gene(member)
         return member
 
-    def run(self, verbose=True):
+    def _mutate_gene(self, member):
         """
-        Conducts genetic algorithm
+        Flips one randomly chosen bit of a member in place
 
-        :param verbose: indicates whether or not to print progress regularly
-        :return: best state and best objective function value
+        :param member: a member
+        :return: None
+        """
+        idx = randint(0, len(member) - 1)
+        member[idx] = 1 - member[idx]
+
+    def _mutate_tracked(self, member):
+        """
+        Randomly mutates a member and reports whether it changed, so unchanged members keep
+        their fitness - _mutate reports by setting self.mutated, as the default does, otherwise
+        only an immutable member that _mutate returns as is counts as unchanged
+
+        :param member: a member
+        :return: mutated member and boolean indicating whether or not it changed
+        """
+        self.mutated = None
+        mutated = self._mutate(member)
+        if self.mutated is not None:
+            return mutated, self.mutated
+        return mutated, mutated is not member or not isinstance(member, (str, bytes, tuple, frozenset))
+
+    def _initialize(self):
+        """
+        Generates and evaluates the initial population
+
+        :return: None
         """
-        self._clear()
         self.population = self._initial_population()
         self._populate_fitness()
-        self.best_member, self.best_fitness = self._most_fit()
+        best_member, self.best_fitness = self._most_fit()
+        self.best_member = self._copy(best_member)
+
+    def _step(self):
+        """
+        Advances the population by one generation and updates the best member
+
+        :return: None
+        """
         num_copy = max(int((1 - self.crossover_rate) * len(self.population)), 2)
         num_crossover = len(self.population) - num_copy
-        for i in range(self.max_steps):
-            self.cur_steps += 1
 
-            if verbose and ((i + 1) % 100 == 0):
-                print(self)
+        survivors = self.selection(self.fitnesses, num_copy)
+        self.population = self._take(survivors)
+        self.fitnesses = list([self.fitnesses[i] for i in survivors])
+
+        parents = self._select_n(2)
+        for _ in range(num_crossover):
+            self.population.append(self._crossover(*parents))
+            self.fitnesses.append(None)
+
+        for i, x in enumerate(self.population):
+            self.population[i], changed = self._mutate_tracked(x)
+            if changed:
+                self.fitnesses[i] = None
+        self._populate_fitness()
+
+        best_member, best_fitness = self._most_fit()
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.best_member = self._copy(best_member)
 
-            self.population = self._select_n(num_copy)
-            self._populate_fitness()
+    def _emigrants(self, n):
+        """
+        Returns copies of the n most fit members of current population
+
+        :param n: number of members
+        :return: list of members and list of their fitnesses
+        """
+        idx = sorted(range(len(self.fitnesses)), key=lambda i: self.fitnesses[i], reverse=True)[:n]
+        return list([self._copy(self.population[i]) for i in idx]), list([self.fitnesses[i] for i in idx])
+
+    def _immigrate(self, members, fitnesses):
+        """
+        Replaces the least fit members of current population with already evaluated members
 
-            parents = self._select_n(2)
-            for _ in range(num_crossover):
-                self.population.append(self._crossover(*parents))
+        :param members: list of members
+        :param fitnesses: list of fitnesses of members
+        :return: None
+        """
+        idx = sorted(range(len(self.fitnesses)), key=lambda i: self.fitnesses[i])[:len(members)]
+        for i, member, fitness in zip(idx, members, fitnesses):
+            self.population[i] = member
+            self.fitnesses[i] = fitness
+            if fitness > self.best_fitness:
+                self.best_fitness = fitness
+                self.best_member = self._copy(member)
+
+    def _task(self):
+        """
+        Returns the function of a single member that workers evaluate - override when
+        fitness is evaluated through another hook
 
-            self.population = list([self._mutate(x) for x in self.population])
-            self._populate_fitness()
+        :return: picklable function of a single member
+        """
+        return HookTask(self, '_fitness')
 
-            best_member, best_fitness = self._most_fit()
-            if best_fitness > self.best_fitness:
-                self.best_fitness = best_fitness
-                self.best_member = deepcopy(best_member)
+    def run(self, verbose=True, workers=None, executor=None, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        """
+        Conducts genetic algorithm
 
-            if self.max_fitness is not None and self.best_fitness >= self.max_fitness:
-                print("TERMINATING - REACHED MAXIMUM FITNESS")
+        :param verbose: indicates whether or not to print progress regularly
+        :param workers: number of processes to evaluate fitness on, None evaluates serially
+        :param executor: concurrent.futures executor to evaluate fitness on instead of spawning a pool
+        :param max_evaluations: maximum number of fitness evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
+        :return: best state and best objective function value
+        """
+        self._clear()
+        with ParallelEvaluator(self._task(), workers, executor) as self.evaluator, \
+                Budget(self, ['_fitness'], ['_fitness_batch'], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._initialize()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if verbose and ((i + 1) % 100 == 0):
+                        print(self)
+
+                    self._step()
+
+                    if self.max_fitness is not None and self.best_fitness >= self.max_fitness:
+                        print("TERMINATING - REACHED MAXIMUM FITNESS")
+                        return self.best_member, self.best_fitness
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+                return self.best_member, self.best_fitness
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
                 return self.best_member, self.best_fitness
-        print("TERMINATING - REACHED MAXIMUM STEPS")
-        return self.best_member, self.best_fitness
@@ -1,6 +1,12 @@
 from abc import ABCMeta, abstractmethod
+from functools import partial
+from heapq import heapify, heapreplace
 from random import choice, random, uniform
-from numpy import argmax, argmin
+from numpy import asarray
+from numpy.random import uniform as np_uniform
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.MemoCache import MemoCache
+from Solid.RunStats import RunStats
 
 
 class HarmonySearch:
@@ -15,15 +21,24 @@ class HarmonySearch:
     hmcr = None
     par = None
     fw = None
+    bounds = None
 
     memory = None
     scores = None
     best = None
+    best_score = None
 
     max_steps = None
     max_score = None
 
-    def __init__(self, hms, hmcr, par, fw, max_steps, max_score=None):
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_improvise', '_random_components', '_random_batch', '_score', '_score_batch',
+                   '_replace_worst')
+
+    def __init__(self, hms, hmcr, par, fw, max_steps, max_score=None,
+                 cache_size=None, cache_key=None, bounds=None):
         """
 
         :param hms: harmony memory size
@@ -32,6 +47,10 @@ class HarmonySearch:
         :param fw: fret width
         :param max_steps: maximum number of steps to run algorithm for
         :param max_score: objective function value to stop algorithm once reached
+        :param cache_size: number of score values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param bounds: list of (low, high) pairs, one per component, to draw random components from uniformly -
+                       required unless _random_harmony is overridden
         """
         if isinstance(hms, int) and hms > 0:
             self.hms = hms
@@ -64,12 +83,26 @@ class HarmonySearch:
             else:
                 raise TypeError('Max score must be a numeric type')
 
+        if bounds is not None:
+            if len(bounds) > 0 and all([len(x) == 2 and x[0] <= x[1] for x in bounds]):
+                self.bounds = list([(float(x[0]), float(x[1])) for x in bounds])
+                self._lows = asarray([x[0] for x in self.bounds])
+                self._highs = asarray([x[1] for x in self.bounds])
+            else:
+                raise TypeError('Bounds must be a non-empty list of (low, high) pairs')
+        elif type(self)._random_harmony == HarmonySearch._random_harmony:
+            raise TypeError('Harmony search without bounds requires overriding _random_harmony')
+
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._score, self), cache_size, cache_key)
+            self._score = self.cache
+
     def __str__(self):
         return ('HARMONY SEARCH: \n' +
                 'CURRENT STEPS: %d \n' +
                 'BEST SCORE: %f \n' +
                 'BEST MEMBER: %s \n\n') % \
-               (self.cur_steps, self._score(self.best), str(self.best))
+               (self.cur_steps, self.best_score, str(self.best))
 
     def __repr__(self):
         return self.__str__()
@@ -83,15 +116,33 @@ class HarmonySearch:
         self.cur_steps = 0
         self.memory = list([self._random_harmony() for _ in range(self.hms)])
         self.scores = None
+        self.best = None
+        self.best_score = None
+        self._heap = None
+        self._best_idx = None
 
-    @abstractmethod
     def _random_harmony(self):
         """
-        Generates a random harmony, represented as a list of floats
+        Generates a random harmony, represented as a list of floats -
+        drawn uniformly within bounds by default, and must be overridden when no bounds are declared
 
         :return: list of harmonies
         """
-        pass
+        return np_uniform(self._lows, self._highs).tolist()
+
+    def _random_components(self, indices):
+        """
+        Generates random values for some components of a harmony - drawn uniformly within bounds
+        when declared, otherwise taken from a single random harmony. Override to generate only
+        the requested components when random harmonies are expensive
+
+        :param indices: list of indices of components
+        :return: list of values, where ith value belongs to component indices[i]
+        """
+        if self.bounds is not None:
+            return np_uniform(self._lows[indices], self._highs[indices]).tolist()
+        harmony = self._random_harmony()
+        return list([harmony[i] for i in indices])
 
     @abstractmethod
     def _score(self, harmony):
@@ -103,13 +154,29 @@ class HarmonySearch:
         """
         pass
 
+    def _score_batch(self, harmonies):
+        """
+        Returns scores of a list of harmonies - override with a vectorized
+        implementation to replace the per-harmony calls to _score
+
+        :param harmonies: list of harmonies
+        :return: sequence of scores, where ith score belongs to ith harmony
+        """
+        return [self._score(x) for x in harmonies]
+
     def _score_all(self):
         """
-        Finds score of all current harmonies in memory
+        Finds score of all current harmonies in memory once, and indexes them by score -
+        a min-heap of scores and indices keeps the worst harmony on top
 
         :return: None
         """
-        self.scores = [self._score(x) for x in self.memory]
+        self.scores = list(self._score_batch(self.memory))
+        self._heap = list([(x, i) for i, x in enumerate(self.scores)])
+        heapify(self._heap)
+        self._best_idx = max(range(len(self.scores)), key=lambda i: self.scores[i])
+        self.best = self.memory[self._best_idx]
+        self.best_score = self.scores[self._best_idx]
 
     def _worst_score(self):
         """
@@ -117,7 +184,7 @@ class HarmonySearch:
 
         :return: index of worst harmony in memory
         """
-        return argmin(self.scores)
+        return self._heap[0][1]
 
     def _best_score(self):
         """
@@ -125,43 +192,86 @@ class HarmonySearch:
 
         :return: index of best harmony in memory
         """
-        return argmax(self.scores)
+        return self._best_idx
 
-    def run(self, verbose=True):
+    def _replace_worst(self, harmony, score):
         """
-        Conducts harmony search
+        Replaces the worst harmony in memory with a better one, keeping scores,
+        the heap and the best harmony up to date without rescoring memory
 
-        :param verbose: indicates whether or not to print progress regularly
-        :return: best state and objective function value of best state
+        :param harmony: a harmony
+        :param score: score of harmony
+        :return: None
         """
-        self._clear()
-        self._score_all()
-        for i in range(self.max_steps):
-            self.cur_steps += 1
-
-            if verbose and ((i + 1) % 100 == 0):
-                print(self)
-
-            self._score_all()
-
-            selected = [0.] * len(self.memory[0])
-            for i in range(len(selected)):
-                if self.hmcr >= random():
-                    selected_component = choice(self.memory)[i]
-                    if self.par >= random():
-                        selected_component += uniform(-1, 1) * self.fw
-                else:
-                    selected_component = self._random_harmony()[i]
+        if score > self._heap[0][0]:
+            i = heapreplace(self._heap, (score, self._heap[0][1]))[1]
+            self.memory[i] = harmony
+            self.scores[i] = score
+            if score > self.best_score:
+                self._best_idx = i
+                self.best = harmony
+                self.best_score = score
+
+    def _improvise(self):
+        """
+        Improvises a new harmony from memory and pitch adjustment, drawing the
+        components not considered from memory in one call to _random_components
+
+        :return: a harmony
+        """
+        selected = [0.] * len(self.memory[0])
+        others = []
+        for i in range(len(selected)):
+            if self.hmcr >= random():
+                selected_component = choice(self.memory)[i]
+                if self.par >= random():
+                    selected_component += uniform(-1, 1) * self.fw
                 selected[i] = selected_component
+            else:
+                others.append(i)
+        if others:
+            for i, x in zip(others, self._random_components(others)):
+                selected[i] = x
+        return selected
 
-            if self._score(selected) > self._score(self.memory[self._worst_score()]):
-                self.memory[self._worst_score()] = selected
-                self.scores[self._worst_score()] = self._score(selected)
+    def _step(self):
+        """
+        Improvises a new harmony and keeps it in memory if it beats the worst harmony
 
-            self.best = self.memory[self._best_score()]
+        :return: None
+        """
+        selected = self._improvise()
+        self._replace_worst(selected, self._score(selected))
+
+    def run(self, verbose=True, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        """
+        Conducts harmony search
 
-            if self.max_score is not None and self._score(self.best) > self.max_score:
-                print("TERMINATING - REACHED MAXIMUM SCORE")
-                return self.best, self._score(self.best)
-        print("TERMINATING - REACHED MAXIMUM STEPS")
-        return self.best, self._score(self.best)
+        :param verbose: indicates whether or not to print progress regularly
+        :param max_evaluations: maximum number of score evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
+        :return: best state and objective function value of best state
+        """
+        self._clear()
+        with Budget(self, ['_score'], ['_score_batch'], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._score_all()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if verbose and ((i + 1) % 100 == 0):
+                        print(self)
+
+                    self._step()
+
+                    if self.max_score is not None and self.best_score > self.max_score:
+                        print("TERMINATING - REACHED MAXIMUM SCORE")
+                        return self.best, self.best_score
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+                return self.best, self.best_score
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
+                return self.best, self.best_score
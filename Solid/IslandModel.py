@@ -0,0 +1,225 @@
+from multiprocessing import Pipe, Process
+from random import seed as random_seed
+from numpy.random import seed as numpy_seed
+
+
+def _send(conn, message):
+    """
+    Sends a message to a worker, ignoring a pipe the worker has already closed - a worker
+    only closes its end early after reporting the error that stopped it
+
+    :param conn: driver end of a pipe to a worker
+    :param message: message to send
+    :return: None
+    """
+    try:
+        conn.send(message)
+    except OSError:
+        pass
+
+
+def _receive(conn):
+    """
+    Receives a reply from a worker, raising the error that stopped the worker if it failed
+
+    :param conn: driver end of a pipe to a worker
+    :return: reply of the worker
+    """
+    reply = conn.recv()
+    if isinstance(reply, Exception):
+        raise reply
+    return reply
+
+
+def _report(conn, error):
+    """
+    Sends the error that stopped a worker to the driver, as a RuntimeError if it cannot be pickled
+
+    :param conn: worker end of a pipe to the driver
+    :param error: exception raised in the worker
+    :return: None
+    """
+    try:
+        conn.send(error)
+    except OSError:
+        pass
+    except Exception:
+        conn.send(RuntimeError(repr(error)))
+
+
+def _island(conn, island, seed):
+    """
+    Runs an island in a worker process, advancing it on request from the driver
+
+    :param conn: worker end of a pipe to the driver
+    :param island: a genetic or evolutionary algorithm
+    :param seed: seed for random number generators, None seeds from system entropy
+    :return: None
+    """
+    try:
+        random_seed(seed)
+        numpy_seed(seed)
+        island._clear()
+        island._initialize()
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            steps, immigrants, migration_size = message
+            island._immigrate(*immigrants)
+            reached = False
+            for _ in range(steps):
+                if island.cur_steps >= island.max_steps:
+                    break
+                island.cur_steps += 1
+                island._step()
+                if island.max_fitness is not None and island.best_fitness >= island.max_fitness:
+                    reached = True
+                    break
+            members, fitnesses = island._emigrants(migration_size)
+            conn.send(((list(members), list(fitnesses)), island.best_member, island.best_fitness, reached))
+    except Exception as e:
+        _report(conn, e)
+    conn.close()
+
+
+class IslandModel:
+    """
+    Conducts island model genetic / evolutionary algorithm, running each island in its own process
+    and periodically migrating the most fit members between islands
+    """
+    islands = None
+
+    migration_interval = None
+    migration_size = None
+    topology = None
+    seed = None
+
+    cur_steps = None
+    max_steps = None
+
+    best_member = None
+    best_fitness = None
+
+    def __init__(self, islands, migration_interval, migration_size, topology='ring', seed=None):
+        """
+
+        :param islands: list of genetic or evolutionary algorithms, one per island
+        :param migration_interval: number of generations between migrations
+        :param migration_size: number of most fit members each island sends per migration
+        :param topology: 'ring' to send to the next island or 'fully_connected' to send to all islands
+        :param seed: seed of the first island, where island i is seeded with seed + i
+        """
+        if len(islands) > 0 and all([hasattr(x, '_step') and hasattr(x, '_immigrate') for x in islands]):
+            self.islands = list(islands)
+        else:
+            raise ValueError('Islands must be a non-empty list of genetic or evolutionary algorithms')
+
+        if isinstance(migration_interval, int) and migration_interval > 0:
+            self.migration_interval = migration_interval
+        else:
+            raise ValueError('Migration interval must be a positive integer')
+
+        if isinstance(migration_size, int) and migration_size >= 0:
+            self.migration_size = migration_size
+        else:
+            raise ValueError('Migration size must be a non-negative integer')
+
+        if topology in ('ring', 'fully_connected'):
+            self.topology = topology
+        else:
+            raise ValueError('Topology must be either "ring" or "fully_connected"')
+
+        if seed is None or isinstance(seed, int):
+            self.seed = seed
+        else:
+            raise ValueError('Seed must be an integer')
+
+        self.max_steps = max([x.max_steps for x in self.islands])
+
+    def __str__(self):
+        return ('ISLAND MODEL: \n' +
+                'CURRENT STEPS: %d \n' +
+                'BEST FITNESS: %f \n' +
+                'BEST MEMBER: %s \n\n') % \
+               (self.cur_steps, self.best_fitness, str(self.best_member))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _clear(self):
+        """
+        Resets the variables that are altered on a per-run basis of the algorithm
+
+        :return: None
+        """
+        self.cur_steps = 0
+        self.best_member = None
+        self.best_fitness = None
+
+    def _route(self, emigrants):
+        """
+        Determines which members each island receives according to the topology
+
+        :param emigrants: list where ith element is the members and fitnesses sent by island i
+        :return: list where ith element is the members and fitnesses received by island i
+        """
+        n = len(emigrants)
+        if self.topology == 'ring':
+            return list([emigrants[i - 1] for i in range(n)])
+        res = []
+        for i in range(n):
+            pool = list([(f, m) for j in range(n) if j != i for m, f in zip(*emigrants[j])])
+            pool.sort(key=lambda x: x[0], reverse=True)
+            pool = pool[:self.migration_size]
+            res.append((list([m for _, m in pool]), list([f for f, _ in pool])))
+        return res
+
+    def run(self, verbose=True):
+        """
+        Conducts island model algorithm
+
+        :param verbose: indicates whether or not to print progress regularly
+        :return: best member across all islands and its fitness
+        """
+        self._clear()
+        conns = []
+        processes = []
+        for i, island in enumerate(self.islands):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_island,
+                              args=(child_conn, island, None if self.seed is None else self.seed + i))
+            process.daemon = True
+            process.start()
+            conns.append(parent_conn)
+            processes.append(process)
+
+        try:
+            immigrants = list([([], []) for _ in self.islands])
+            while self.cur_steps < self.max_steps:
+                steps = min(self.migration_interval, self.max_steps - self.cur_steps)
+                for conn, x in zip(conns, immigrants):
+                    _send(conn, (steps, x, self.migration_size))
+                replies = list([_receive(conn) for conn in conns])
+                self.cur_steps += steps
+
+                for _, best_member, best_fitness, _ in replies:
+                    if self.best_fitness is None or best_fitness > self.best_fitness:
+                        self.best_member, self.best_fitness = best_member, best_fitness
+
+                if verbose and (self.cur_steps // 100) > ((self.cur_steps - steps) // 100):
+                    print(self)
+
+                if any([x[3] for x in replies]):
+                    print("TERMINATING - REACHED MAXIMUM FITNESS")
+                    return self.best_member, self.best_fitness
+
+                immigrants = self._route(list([x[0] for x in replies]))
+            print("TERMINATING - REACHED MAXIMUM STEPS")
+            return self.best_member, self.best_fitness
+        finally:
+            for conn in conns:
+                _send(conn, None)
+                conn.close()
+            for process in processes:
+                process.join()
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+def default_key(member):
+    """
+    Builds a hashable cache key for a member -
+    lists and tuples are converted recursively, numpy arrays are keyed by their raw bytes
+
+    :param member: a member
+    :return: hashable key for member
+    """
+    if hasattr(member, 'tobytes') and hasattr(member, 'dtype'):
+        return member.shape, member.dtype.str, member.tobytes()
+    if isinstance(member, (list, tuple)):
+        return tuple(default_key(x) for x in member)
+    return member
+
+
+class MemoCache:
+    """
+    Memoizes a fitness / objective function with bounded LRU eviction - the store is locked so
+    threads of a pool may share the cache, the function itself is evaluated outside the lock
+    """
+    func = None
+    max_size = None
+    key = None
+
+    hits = None
+    misses = None
+
+    def __init__(self, func, max_size, key=None):
+        """
+
+        :param func: function of a single member to memoize
+        :param max_size: maximum number of values to keep before evicting the least recently used
+        :param key: function mapping a member to a hashable key, defaults to default_key
+        """
+        if callable(func):
+            self.func = func
+        else:
+            raise ValueError('Cached function must be callable')
+
+        if isinstance(max_size, int) and max_size > 0:
+            self.max_size = max_size
+        else:
+            raise ValueError('Cache size must be a positive integer')
+
+        if key is None:
+            self.key = default_key
+        elif callable(key):
+            self.key = key
+        else:
+            raise ValueError('Cache key must be callable')
+
+        self._store = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __str__(self):
+        return ('MEMO CACHE: \n' +
+                'HITS: %d \n' +
+                'MISSES: %d \n' +
+                'SIZE: %d \n\n') % \
+               (self.hits, self.misses, len(self._store))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __call__(self, member):
+        """
+        Returns cached value for member, evaluating and storing it on a miss
+
+        :param member: a member
+        :return: value of function applied to member
+        """
+        k = self.key(member)
+        with self._lock:
+            try:
+                value = self._store.pop(k)
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store[k] = value
+                return value
+        value = self.func(member)
+        with self._lock:
+            self._store.pop(k, None)
+            if len(self._store) >= self.max_size:
+                self._store.popitem(last=False)
+            self._store[k] = value
+        return value
+
+    def clear(self):
+        """
+        Empties the cache and resets hit and miss counters
+
+        :return: None
+        """
+        with self._lock:
+            self._store.clear()
+            self.hits = 0
+            self.misses = 0
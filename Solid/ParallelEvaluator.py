@@ -0,0 +1,169 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import cpu_count
+from Solid.MemoCache import MemoCache
+
+
+_worker_func = None
+
+
+def _install(func):
+    """
+    Stores the evaluated function in a pool worker so it is only pickled once per worker
+
+    :param func: function of a single member
+    :return: None
+    """
+    global _worker_func
+    _worker_func = func
+
+
+def _evaluate_installed(chunk):
+    """
+    Evaluates a chunk of members with the function installed in this worker
+
+    :param chunk: list of members
+    :return: list of values
+    """
+    return [_worker_func(x) for x in chunk]
+
+
+def _evaluate(func, chunk):
+    """
+    Evaluates a chunk of members with func
+
+    :param func: function of a single member
+    :param chunk: list of members
+    :return: list of values
+    """
+    return [func(x) for x in chunk]
+
+
+class HookTask:
+    """
+    Calls an evaluation hook of an optimizer, pickling as the optimizer's class and its state
+    without run state such as the population, so tasks sent to workers stay small - the hook's
+    cache and the wrappers of a run are left behind as well, and a worker builds its own cache
+    """
+    owner = None
+    name = None
+    cached = None
+
+    def __init__(self, owner, name, cached=None):
+        """
+
+        :param owner: optimizer whose hook is called
+        :param name: name of the hook, a function of a single member
+        :param cached: name of the hook memoized by the optimizer's cache, defaults to name
+        """
+        self.owner = owner
+        self.name = name
+        self.cached = cached or name
+
+    def __call__(self, member):
+        return getattr(self.owner, self.name)(member)
+
+    def __getstate__(self):
+        owner = self.owner
+        skipped = set(['cache', 'evaluator', 'budget', 'stats'] + list(getattr(owner, 'run_state', ())))
+        state = dict([(k, v) for k, v in owner.__dict__.items()
+                      if k not in skipped and not callable(getattr(type(owner), k, None))])
+        cache = owner.__dict__.get('cache')
+        return {'owner_class': type(owner), 'state': state, 'name': self.name, 'cached': self.cached,
+                'cache': None if cache is None else (cache.max_size, cache.key)}
+
+    def __setstate__(self, state):
+        cls = state['owner_class']
+        self.owner = cls.__new__(cls)
+        self.owner.__dict__.update(state['state'])
+        self.name = state['name']
+        self.cached = state['cached']
+        if state['cache'] is not None:
+            self.owner.cache = MemoCache(partial(getattr(cls, self.cached), self.owner), *state['cache'])
+            setattr(self.owner, self.cached, self.owner.cache)
+
+
+class ParallelEvaluator:
+    """
+    Evaluates a function over lists of members, optionally on a concurrent.futures pool
+    """
+    func = None
+    workers = None
+    executor = None
+    chunk_size = None
+
+    def __init__(self, func, workers=None, executor=None, chunk_size=None):
+        """
+
+        :param func: function of a single member, must be picklable for process pools - it is pickled with
+                     every task sent to a caller's executor, so optimizers pass a HookTask
+        :param workers: number of worker processes to spawn, None evaluates serially unless executor is given
+        :param executor: existing concurrent.futures executor to submit to, it is not shut down on close
+        :param chunk_size: number of members per submitted task, defaults to four tasks per worker
+        """
+        if workers is not None and not (isinstance(workers, int) and workers > 0):
+            raise ValueError('Workers must be a positive integer')
+
+        if chunk_size is not None and not (isinstance(chunk_size, int) and chunk_size > 0):
+            raise ValueError('Chunk size must be a positive integer')
+
+        self.func = func
+        self.workers = workers or cpu_count()
+        self.chunk_size = chunk_size
+        self._owned = False
+
+        if executor is not None:
+            self.executor = executor
+        elif workers is not None:
+            self.executor = ProcessPoolExecutor(workers, initializer=_install, initargs=(func,))
+            self._owned = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['executor'] = None
+        state['_owned'] = False
+        return state
+
+    @property
+    def parallel(self):
+        """
+        Whether or not map evaluates members on a pool - serial callers may call func themselves
+        """
+        return self.executor is not None
+
+    def map(self, members):
+        """
+        Evaluates func over members, preserving their order
+
+        :param members: list of members
+        :return: list of values, where ith value belongs to ith member
+        """
+        if self.executor is None:
+            return [self.func(x) for x in members]
+        size = self.chunk_size or max(1, -(-len(members) // (4 * self.workers)))
+        chunks = [members[i:i + size] for i in range(0, len(members), size)]
+        if self._owned:
+            futures = [self.executor.submit(_evaluate_installed, x) for x in chunks]
+        else:
+            futures = [self.executor.submit(_evaluate, self.func, x) for x in chunks]
+        res = []
+        for x in futures:
+            res.extend(x.result())
+        return res
+
+    def close(self):
+        """
+        Shuts down the pool if it was spawned by this evaluator - later calls to map are serial
+
+        :return: None
+        """
+        if self._owned:
+            self.executor.shutdown()
+        self.executor = None
+        self._owned = False
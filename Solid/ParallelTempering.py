@@ -0,0 +1,209 @@
+from math import exp
+from multiprocessing import Pipe, Process
+from random import random, seed as random_seed
+from numpy.random import seed as numpy_seed
+from Solid.IslandModel import _receive, _report, _send
+
+
+def _replica(conn, replica, seed):
+    """
+    Runs a simulated annealing replica in a worker process, advancing it on request from the driver
+
+    :param conn: worker end of a pipe to the driver
+    :param replica: a simulated annealing algorithm
+    :param seed: seed for random number generators, None seeds from system entropy
+    :return: None
+    """
+    try:
+        random_seed(seed)
+        numpy_seed(seed)
+        replica._clear()
+        replica._initialize()
+        sent_energy = None
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            steps, temp = message
+            if temp is not None:
+                replica.current_temp = temp
+            reached = False
+            for _ in range(steps):
+                if replica.cur_steps >= replica.max_steps or replica.current_temp < 0.000001:
+                    break
+                replica.cur_steps += 1
+                replica._step()
+                if replica.min_energy is not None and replica.current_energy < replica.min_energy:
+                    reached = True
+                    break
+                replica.adjust_temp()
+            active = replica.cur_steps < replica.max_steps and replica.current_temp >= 0.000001
+            best_state = None
+            if sent_energy is None or replica.best_energy < sent_energy:
+                best_state, sent_energy = replica.best_state, replica.best_energy
+            conn.send((replica.current_energy, replica.current_temp, best_state, replica.best_energy, active, reached))
+    except Exception as e:
+        _report(conn, e)
+    conn.close()
+
+
+class ParallelTempering:
+    """
+    Conducts parallel tempering (replica exchange), running simulated annealing replicas at a ladder
+    of temperatures in their own processes and periodically swapping adjacent replicas by the
+    Metropolis criterion - replicas exchange temperatures rather than states, which is equivalent
+    but sends two floats between processes instead of two states
+    """
+    replicas = None
+
+    swap_interval = None
+    seed = None
+
+    cur_steps = None
+    max_steps = None
+
+    swaps_attempted = None
+    swaps_accepted = None
+
+    best_state = None
+    best_energy = None
+
+    def __init__(self, replicas, swap_interval, seed=None):
+        """
+
+        :param replicas: list of simulated annealing algorithms, one per rung of the temperature ladder
+                         set by their starting temperatures
+        :param swap_interval: number of steps each replica takes between swaps
+        :param seed: seed of the first replica, where replica i is seeded with seed + i
+        """
+        if len(replicas) > 0 and all([hasattr(x, '_step') and hasattr(x, 'adjust_temp') for x in replicas]):
+            self.replicas = list(replicas)
+        else:
+            raise ValueError('Replicas must be a non-empty list of simulated annealing algorithms')
+
+        if isinstance(swap_interval, int) and swap_interval > 0:
+            self.swap_interval = swap_interval
+        else:
+            raise ValueError('Swap interval must be a positive integer')
+
+        if seed is None or isinstance(seed, int):
+            self.seed = seed
+        else:
+            raise ValueError('Seed must be an integer')
+
+        self.max_steps = max([x.max_steps for x in self.replicas])
+
+    def __str__(self):
+        return ('PARALLEL TEMPERING: \n' +
+                'CURRENT STEPS: %d \n' +
+                'SWAPS ACCEPTED: %d / %d \n' +
+                'BEST ENERGY: %f \n' +
+                'BEST STATE: %s \n\n') % \
+               (self.cur_steps, self.swaps_accepted, self.swaps_attempted, self.best_energy, str(self.best_state))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _clear(self):
+        """
+        Resets the variables that are altered on a per-run basis of the algorithm
+
+        :return: None
+        """
+        self.cur_steps = 0
+        self.swaps_attempted = 0
+        self.swaps_accepted = 0
+        self.best_state = None
+        self.best_energy = None
+
+    def _accept_swap(self, energy1, temp1, energy2, temp2):
+        """
+        Probabilistically determines whether or not two replicas exchange temperatures
+
+        :param energy1: current energy of first replica
+        :param temp1: current temperature of first replica
+        :param energy2: current energy of second replica
+        :param temp2: current temperature of second replica
+        :return: boolean indicating whether or not swap is accepted
+        """
+        x = (1. / temp1 - 1. / temp2) * (energy1 - energy2)
+        return True if x >= 0 else exp(x) >= random()
+
+    def _swap(self, energies, temps, active, parity):
+        """
+        Attempts swaps between active replicas adjacent in temperature, pairing every other
+        neighbor starting from parity so that each replica takes part in at most one swap
+
+        :param energies: list of current energies of replicas
+        :param temps: list of current temperatures of replicas
+        :param active: list indicating whether or not each replica is still annealing
+        :param parity: 0 or 1, offset of the first pair in the ladder
+        :return: list of new temperatures, None where a replica's temperature is unchanged
+        """
+        ladder = sorted([i for i in range(len(temps)) if active[i]], key=lambda i: temps[i])
+        res = [None] * len(temps)
+        for k in range(parity, len(ladder) - 1, 2):
+            i, j = ladder[k], ladder[k + 1]
+            self.swaps_attempted += 1
+            if self._accept_swap(energies[i], temps[i], energies[j], temps[j]):
+                self.swaps_accepted += 1
+                res[i], res[j] = temps[j], temps[i]
+        return res
+
+    def run(self, verbose=True):
+        """
+        Conducts parallel tempering
+
+        :param verbose: indicates whether or not to print progress regularly
+        :return: best state across all replicas and its energy
+        """
+        self._clear()
+        conns = []
+        processes = []
+        for i, replica in enumerate(self.replicas):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_replica,
+                              args=(child_conn, replica, None if self.seed is None else self.seed + i))
+            process.daemon = True
+            process.start()
+            conns.append(parent_conn)
+            processes.append(process)
+
+        try:
+            temps = list([None for _ in self.replicas])
+            parity = 0
+            while self.cur_steps < self.max_steps:
+                steps = min(self.swap_interval, self.max_steps - self.cur_steps)
+                for conn, x in zip(conns, temps):
+                    _send(conn, (steps, x))
+                replies = list([_receive(conn) for conn in conns])
+                self.cur_steps += steps
+
+                for _, _, best_state, best_energy, _, _ in replies:
+                    if best_state is not None and (self.best_energy is None or best_energy < self.best_energy):
+                        self.best_state, self.best_energy = best_state, best_energy
+
+                if verbose and (self.cur_steps // 100) > ((self.cur_steps - steps) // 100):
+                    print(self)
+
+                if any([x[5] for x in replies]):
+                    print("TERMINATING - REACHED MINIMUM ENERGY")
+                    return self.best_state, self.best_energy
+
+                active = list([x[4] for x in replies])
+                if not any(active):
+                    break
+
+                temps = self._swap(list([x[0] for x in replies]), list([x[1] for x in replies]), active, parity)
+                parity = 1 - parity
+            if all([x[1] < 0.000001 for x in replies]):
+                print("TERMINATING - REACHED TEMPERATURE OF 0")
+            else:
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+            return self.best_state, self.best_energy
+        finally:
+            for conn in conns:
+                _send(conn, None)
+                conn.close()
+            for process in processes:
+                process.join()
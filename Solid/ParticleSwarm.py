@@ -1,7 +1,12 @@
 from abc import ABCMeta, abstractmethod
-from random import random
-from numpy import apply_along_axis, argmin, array, copy, diag_indices_from, dot, zeros
+from functools import partial
+from numpy import argmin, array, asarray, dtype as numpy_dtype, empty, float64, multiply, subtract
 from numpy.random import uniform
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.MemoCache import MemoCache
+from Solid.ParallelEvaluator import HookTask, ParallelEvaluator
+from Solid.RunStats import RunStats
+from Solid.SharedSwarmEvaluator import SharedSwarmEvaluator
 
 
 class ParticleSwarm:
@@ -19,7 +24,9 @@ class ParticleSwarm:
     vel = None
     scores = None
     best = None
+    best_scores = None
     global_best = None
+    global_best_score = None
 
     c1 = None
     c2 = None
@@ -29,8 +36,18 @@ class ParticleSwarm:
     max_steps = None
     min_objective = None
 
+    dtype = None
+
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_objective', '_objective_batch', '_update_velocity', '_best', '_global_best')
+    run_state = ('pos', 'vel', 'scores', 'best', 'best_scores', '_buffer')
+    evaluator = None
+
     def __init__(self, swarm_size, member_size, lower_bound, upper_bound, c1, c2, c3,
-                 max_steps, min_objective=None):
+                 max_steps, min_objective=None,
+                 cache_size=None, cache_key=None, dtype=float64):
         """
 
         :param swarm_size: number of members in swarm
@@ -42,6 +59,9 @@ class ParticleSwarm:
         :param c3: constant for 3rd term in velocity calculation
         :param max_steps: maximum steps to run algorithm for
         :param min_objective: objective function value to stop algorithm once reached
+        :param cache_size: number of objective values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param dtype: floating point type of positions and velocities, such as numpy.float32
         """
         if isinstance(swarm_size, int) and swarm_size > 0:
             self.swarm_size = swarm_size
@@ -53,23 +73,21 @@ class ParticleSwarm:
         else:
             raise ValueError('Member size must be a positive integer')
 
+        if numpy_dtype(dtype).kind == 'f':
+            self.dtype = numpy_dtype(dtype)
+        else:
+            raise ValueError('Dtype must be a floating point type')
+
         if all([isinstance(x, (int, float)) for x in lower_bound]):
-            self.lower_bound = array([float(x) for x in lower_bound])
+            self.lower_bound = array([float(x) for x in lower_bound], dtype=self.dtype)
         else:
             raise ValueError('Lower bounds must be numeric types')
 
         if all([isinstance(x, (int, float)) for x in upper_bound]):
-            self.upper_bound = array([float(x) for x in upper_bound])
+            self.upper_bound = array([float(x) for x in upper_bound], dtype=self.dtype)
         else:
             raise ValueError('Upper bounds must be numeric types')
 
-        self.pos = uniform(self.lower_bound, self.upper_bound, size=(swarm_size, member_size))
-
-        self.vel = uniform(self.lower_bound - self.upper_bound, self.upper_bound - self.lower_bound,
-                           size=(swarm_size, member_size))
-
-        self.best = copy(self.pos)
-
         if isinstance(c1, (int, float)) and isinstance(c2, (int, float)) and isinstance(c3, (int, float)):
             self.c1 = float(c1)
             self.c2 = float(c2)
@@ -88,12 +106,16 @@ class ParticleSwarm:
             else:
                 raise ValueError()
 
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._objective, self), cache_size, cache_key)
+            self._objective = self.cache
+
     def __str__(self):
         return ('PARTICLE SWARM: \n' +
                 'CURRENT STEPS: %d \n' +
                 'BEST FITNESS: %f \n' +
                 'BEST MEMBER: %s \n\n') % \
-               (self.cur_steps, self._objective(self.global_best[0]), str(self.global_best[0]))
+               (self.cur_steps, self.global_best_score, str(self.global_best))
 
     def __repr__(self):
         return self.__str__()
@@ -104,12 +126,20 @@ class ParticleSwarm:
 
         :return: None
         """
-        self.pos = uniform(self.lower_bound, self.upper_bound, size=(self.swarm_size, self.member_size))
-        self.vel = uniform(self.lower_bound - self.upper_bound, self.upper_bound - self.lower_bound,
-                           size=(self.swarm_size, self.member_size))
+        size = (self.swarm_size, self.member_size)
+        if isinstance(self.evaluator, SharedSwarmEvaluator):
+            self.pos, self.vel = self.evaluator.pos, self.evaluator.vel
+        else:
+            self.pos, self.vel = empty(size, dtype=self.dtype), empty(size, dtype=self.dtype)
+        self.pos[:] = uniform(self.lower_bound, self.upper_bound, size=size)
+        self.vel[:] = uniform(self.lower_bound - self.upper_bound, self.upper_bound - self.lower_bound, size=size)
+        self._buffer = empty(size, dtype=self.dtype)
         self.scores = self._score(self.pos)
-        self.best = copy(self.pos)
+        self.best = self.pos.copy()
+        self.best_scores = self.scores.copy()
         self.cur_steps = 0
+        self.global_best = None
+        self.global_best_score = None
         self._global_best()
 
     @abstractmethod
@@ -123,6 +153,18 @@ class ParticleSwarm:
         """
         pass
 
+    def _objective_batch(self, pos):
+        """
+        Returns objective function values for all members of swarm - override with a
+        vectorized implementation to replace the per-member calls to _objective
+
+        :param pos: position matrix, one member per row
+        :return: sequence of objective function values, where ith value belongs to ith row
+        """
+        if self.evaluator is not None and self.evaluator.parallel:
+            return self.evaluator.map(pos)
+        return [self._objective(x) for x in pos]
+
     def _score(self, pos):
         """
         Applies objective function to all members of swarm
@@ -130,25 +172,17 @@ class ParticleSwarm:
         :param pos: position matrix
         :return: score vector
         """
-        return apply_along_axis(self._objective, 1, pos)
+        return asarray(self._objective_batch(pos), dtype=float64)
 
-    def _best(self, old, new):
+    def _best(self):
         """
-        Finds the best objective function values for each member of swarm
+        Updates the best position and score of each member of swarm from current scores
 
-        :param old: old values
-        :param new: new values
         :return: None
         """
-        old_scores = self._score(old)
-        new_scores = self._score(new)
-        best = []
-        for i in range(len(old_scores)):
-            if old_scores[i] < new_scores[i]:
-                best.append(old[i])
-            else:
-                best.append(new[i])
-        self.best = array(best)
+        improved = self.scores < self.best_scores
+        self.best[improved] = self.pos[improved]
+        self.best_scores[improved] = self.scores[improved]
 
     def _global_best(self):
         """
@@ -156,41 +190,76 @@ class ParticleSwarm:
 
         :return: None
         """
-        if self.global_best is None or min(self.scores) < self._objective(self.global_best[0]):
-            self.global_best = array([self.pos[argmin(self.scores)]] * self.swarm_size)
+        i = argmin(self.best_scores)
+        if self.global_best is None or self.best_scores[i] < self.global_best_score:
+            self.global_best = self.best[i].copy()
+            self.global_best_score = self.best_scores[i]
+
+    def _update_velocity(self):
+        """
+        Updates velocities in place, scaling the pull towards each particle's best and the
+        global best by a random multiplier per particle
 
-    def run(self, verbose=True):
+        :return: None
+        """
+        r1 = uniform(size=(self.swarm_size, 1)).astype(self.dtype)
+        r2 = uniform(size=(self.swarm_size, 1)).astype(self.dtype)
+        self.vel *= self.c1
+        subtract(self.best, self.pos, out=self._buffer)
+        multiply(self._buffer, r1 * self.c2, out=self._buffer)
+        self.vel += self._buffer
+        subtract(self.global_best, self.pos, out=self._buffer)
+        multiply(self._buffer, r2 * self.c3, out=self._buffer)
+        self.vel += self._buffer
+
+    def run(self, verbose=True, workers=None, executor=None, shared_memory=False,
+            max_evaluations=None, time_limit=None, stats=False, profile=False):
         """
         Conducts particle swarm optimization
 
         :param verbose: indicates whether or not to print progress regularly
+        :param workers: number of processes to evaluate the swarm on, None evaluates serially
+        :param executor: concurrent.futures executor to evaluate the swarm on instead of spawning a pool
+        :param shared_memory: indicates whether or not workers score the swarm in place in shared memory
+        :param max_evaluations: maximum number of objective function evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
         :return: best member of swarm and objective function value of best member of swarm
         """
-        self._clear()
-        for i in range(self.max_steps):
-            self.cur_steps += 1
-
-            if verbose and ((i + 1) % 100 == 0):
-                print(self)
-
-            u1 = zeros((self.swarm_size, self.swarm_size))
-            u1[diag_indices_from(u1)] = [random() for x in range(self.swarm_size)]
-            u2 = zeros((self.swarm_size, self.swarm_size))
-            u2[diag_indices_from(u2)] = [random() for x in range(self.swarm_size)]
-
-            vel_new = (self.c1 * self.vel) + \
-                      (self.c2 * dot(u1, (self.best - self.pos))) + \
-                      (self.c3 * dot(u2, (self.global_best - self.pos)))
-
-            pos_new = self.pos + vel_new
-
-            self._best(self.pos, pos_new)
-            self.pos = pos_new
-            self.scores = self._score(self.pos)
-            self._global_best()
-
-            if self._objective(self.global_best[0]) < (self.min_objective or 0):
-                print("TERMINATING - REACHED MINIMUM OBJECTIVE")
-                return self.global_best[0], self._objective(self.global_best[0])
-        print("TERMINATING - REACHED MAXIMUM STEPS")
-        return self.global_best[0], self._objective(self.global_best[0])
+        if shared_memory:
+            if executor is not None:
+                raise ValueError('Shared memory evaluation spawns its own workers and cannot use an executor')
+            evaluator = SharedSwarmEvaluator(HookTask(self, '_objective'), self.swarm_size, self.member_size,
+                                             self.dtype, workers)
+        else:
+            evaluator = ParallelEvaluator(HookTask(self, '_objective'), workers, executor)
+        with evaluator as self.evaluator, \
+                Budget(self, ['_objective'], ['_objective_batch'], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._clear()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if verbose and ((i + 1) % 100 == 0):
+                        print(self)
+
+                    self._update_velocity()
+                    self.pos += self.vel
+
+                    self.scores = self._score(self.pos)
+                    self._best()
+                    self._global_best()
+
+                    if self.global_best_score < (self.min_objective or 0):
+                        print("TERMINATING - REACHED MINIMUM OBJECTIVE")
+                        return self.global_best, self.global_best_score
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+                return self.global_best, self.global_best_score
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
+                return self.global_best, self.global_best_score
+            finally:
+                if shared_memory:
+                    self.pos, self.vel = self.pos.copy(), self.vel.copy()
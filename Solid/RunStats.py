@@ -0,0 +1,174 @@
+from cProfile import Profile
+from pstats import Stats
+from time import perf_counter
+
+
+class _Timed:
+    """
+    Wraps a hook to accumulate its number of calls and the time spent in it,
+    including time spent in any hooks it calls
+    """
+    stats = None
+    name = None
+    func = None
+
+    def __init__(self, stats, name, func):
+        self.stats = stats
+        self.name = name
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.stats.times[self.name] += perf_counter() - start
+            self.stats.calls[self.name] += 1
+
+
+class RunStats:
+    """
+    Collects evaluation counts, cache hits and the time spent in the hooks of an optimizer
+    over a run, optionally capturing a cProfile profile - hooks are only wrapped when enabled,
+    and calls made in worker processes are not timed
+    """
+    owner = None
+    budget = None
+    hooks = None
+    enabled = None
+
+    times = None
+    calls = None
+    profiler = None
+
+    start_time = None
+    end_time = None
+
+    def __init__(self, owner, budget, hooks, enabled=False, profile=False):
+        """
+
+        :param owner: optimizer whose hooks are timed
+        :param budget: budget of the run, which counts evaluations when stats are enabled
+        :param hooks: names of hooks and callable attributes of owner to time
+        :param enabled: indicates whether or not to count evaluations and time hooks
+        :param profile: indicates whether or not to capture a cProfile profile of the run
+        """
+        self.owner = owner
+        self.budget = budget
+        self.hooks = list([x for x in hooks if hasattr(owner, x)])
+        self.enabled = bool(enabled)
+        self.times = {}
+        self.calls = {}
+        self._profile = bool(profile)
+        self._saved = []
+        self._cache_start = None
+
+    def __enter__(self):
+        cache = getattr(self.owner, 'cache', None)
+        self._cache_start = None if cache is None else (cache.hits, cache.misses)
+        if self.enabled:
+            for name in self.hooks:
+                self.times[name] = 0.
+                self.calls[name] = 0
+                self._saved.append((name, self.owner.__dict__.get(name)))
+                setattr(self.owner, name, _Timed(self, name, getattr(self.owner, name)))
+        if self._profile:
+            self.profiler = Profile()
+        self.end_time = None
+        self.start_time = perf_counter()
+        if self._profile:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *args):
+        if self._profile:
+            self.profiler.disable()
+        self.end_time = perf_counter()
+        for name, hook in reversed(self._saved):
+            if hook is None:
+                delattr(self.owner, name)
+            else:
+                setattr(self.owner, name, hook)
+        self._saved = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['profiler'] = None
+        state['_saved'] = []
+        return state
+
+    def __str__(self):
+        res = ('RUN STATS: \n' +
+               'EVALUATIONS: %s \n' +
+               'CACHE HITS: %s \n' +
+               'ELAPSED SECONDS: %f \n' +
+               'EVALUATIONS PER SECOND: %s \n') % \
+              (self.evaluations, self.cache_hits, self.elapsed(), self.evaluations_per_second())
+        for name in sorted(self.times, key=lambda x: self.times[x], reverse=True):
+            res += '%s: %d CALLS, %f SECONDS \n' % (name, self.calls[name], self.times[name])
+        return res + '\n'
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def evaluations(self):
+        """
+        Number of evaluations made so far, None unless stats are enabled or the run has a budget
+        """
+        if self.budget is None or not self.budget.count:
+            return None
+        return self.budget.evaluations
+
+    @property
+    def cache_hits(self):
+        """
+        Number of cache hits so far in this run, None without a cache
+        """
+        cache = getattr(self.owner, 'cache', None)
+        if cache is None or self._cache_start is None:
+            return None
+        return cache.hits - self._cache_start[0]
+
+    @property
+    def cache_misses(self):
+        """
+        Number of cache misses so far in this run, None without a cache
+        """
+        cache = getattr(self.owner, 'cache', None)
+        if cache is None or self._cache_start is None:
+            return None
+        return cache.misses - self._cache_start[1]
+
+    def elapsed(self):
+        """
+        Returns seconds spent in the run, so far if it is still going
+
+        :return: elapsed wall-clock time
+        """
+        if self.start_time is None:
+            return 0.
+        return (perf_counter() if self.end_time is None else self.end_time) - self.start_time
+
+    def evaluations_per_second(self):
+        """
+        Returns the rate of evaluations over the run
+
+        :return: evaluations per second, None if evaluations are not counted
+        """
+        elapsed = self.elapsed()
+        if self.evaluations is None or elapsed <= 0:
+            return None
+        return self.evaluations / elapsed
+
+    def print_profile(self, sort='cumulative', limit=20):
+        """
+        Prints the functions taking the most time in the profiled run
+
+        :param sort: pstats sort key
+        :param limit: number of functions to print
+        :return: None
+        """
+        if self.profiler is None:
+            raise ValueError('Run was not profiled')
+        Stats(self.profiler).sort_stats(sort).print_stats(limit)
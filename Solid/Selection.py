@@ -0,0 +1,85 @@
+from numpy import arange, argmax, argsort, asarray, cumsum, empty, searchsorted
+from numpy.random import permutation, randint, uniform
+
+
+def _cumulative(fitnesses):
+    """
+    Sums fitnesses cumulatively, shifting them up by the lowest fitness when any is negative
+    so that the result is non-decreasing
+
+    :param fitnesses: fitness of each member
+    :return: cumulative sum of non-negative weights
+    """
+    weights = asarray(fitnesses, dtype=float)
+    if weights.min() < 0:
+        weights = weights - weights.min()
+    return cumsum(weights)
+
+
+def _sample_cumulative(cumulative, points):
+    """
+    Maps points in [0, total) onto indices of a cumulative weight array with a binary search
+
+    :param cumulative: cumulative sum of non-negative weights
+    :param points: points to look up
+    :return: array of indices
+    """
+    return searchsorted(cumulative, points, side='right').clip(0, len(cumulative) - 1)
+
+
+def roulette(fitnesses, n):
+    """
+    Selects n indices with probability proportional to fitness, shifted up by the lowest
+    fitness when any is negative - indices are uniform when all weights are zero
+
+    :param fitnesses: fitness of each member
+    :param n: number of indices to select
+    :return: array of n indices
+    """
+    cumulative = _cumulative(fitnesses)
+    if cumulative[-1] <= 0:
+        return randint(0, len(cumulative), n)
+    return _sample_cumulative(cumulative, uniform(0, cumulative[-1], n))
+
+
+def stochastic_universal(fitnesses, n):
+    """
+    Selects n indices with probability proportional to fitness, using n evenly spaced
+    pointers over a single spin of the wheel - weights are shifted and zero weights handled as in roulette
+
+    :param fitnesses: fitness of each member
+    :param n: number of indices to select
+    :return: array of n indices, in random order
+    """
+    cumulative = _cumulative(fitnesses)
+    if cumulative[-1] <= 0:
+        return randint(0, len(cumulative), n)
+    step = cumulative[-1] / n
+    return permutation(_sample_cumulative(cumulative, uniform(0, step) + step * arange(n)))
+
+
+def tournament(fitnesses, n, size=2):
+    """
+    Selects n indices, each the fittest of size members drawn uniformly at random
+
+    :param fitnesses: fitness of each member
+    :param n: number of indices to select
+    :param size: number of members per tournament
+    :return: array of n indices
+    """
+    fitnesses = asarray(fitnesses, dtype=float)
+    contenders = randint(0, len(fitnesses), (n, size))
+    return contenders[arange(n), argmax(fitnesses[contenders], axis=1)]
+
+
+def rank(fitnesses, n):
+    """
+    Selects n indices with probability proportional to rank, where the least fit member has rank 1
+
+    :param fitnesses: fitness of each member
+    :param n: number of indices to select
+    :return: array of n indices
+    """
+    ranks = empty(len(fitnesses))
+    ranks[argsort(asarray(fitnesses, dtype=float), kind='stable')] = arange(1, len(fitnesses) + 1)
+    return roulette(ranks, n)
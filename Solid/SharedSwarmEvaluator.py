@@ -0,0 +1,176 @@
+from multiprocessing import Barrier, Process, SimpleQueue, Value, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from traceback import clear_frames
+from numpy import dtype as numpy_dtype, float64, linspace, ndarray
+
+
+def _attach(name):
+    """
+    Attaches to an existing shared memory block created by the driver process, which alone unlinks it
+
+    :param name: name of shared memory block
+    :return: SharedMemory
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def _evaluate_rows(func, pos_name, scores_name, shape, dtype, start, stop, begin, end, done, errors):
+    """
+    Worker loop scoring rows start to stop of the shared position matrix once per step
+
+    :param func: objective function of a single member
+    :param pos_name: name of shared position block
+    :param scores_name: name of shared score block
+    :param shape: shape of position matrix
+    :param dtype: dtype of position matrix
+    :param start: first row evaluated by this worker
+    :param stop: row after the last row evaluated by this worker
+    :param begin: barrier waited on before each step
+    :param end: barrier waited on after each step
+    :param done: shared flag set when workers should exit
+    :param errors: queue to report an error scoring rows on, before breaking the end barrier
+    :return: None
+    """
+    pos_shm = _attach(pos_name)
+    scores_shm = _attach(scores_name)
+    pos = ndarray(shape, dtype=dtype, buffer=pos_shm.buf)
+    scores = ndarray(shape[0], dtype=float64, buffer=scores_shm.buf)
+    try:
+        while True:
+            begin.wait()
+            if done.value:
+                break
+            try:
+                for i in range(start, stop):
+                    scores[i] = func(pos[i])
+            except Exception as e:
+                try:
+                    errors.put(e)
+                except Exception:
+                    errors.put(RuntimeError(repr(e)))
+                end.abort()
+                return
+            end.wait()
+    except BrokenBarrierError:
+        pass
+    finally:
+        del pos, scores
+        pos_shm.close()
+        scores_shm.close()
+
+
+class SharedSwarmEvaluator:
+    """
+    Evaluates a swarm whose positions, velocities and scores live in shared memory, using
+    persistent worker processes that each score a fixed slice of rows in place
+    """
+    func = None
+    workers = None
+
+    pos = None
+    vel = None
+    scores = None
+
+    def __init__(self, func, swarm_size, member_size, dtype=float64, workers=None):
+        """
+
+        :param func: objective function of a single member, must be picklable
+        :param swarm_size: number of members in swarm
+        :param member_size: number of components per member vector
+        :param dtype: floating point type of positions and velocities
+        :param workers: number of worker processes, defaults to the number of cpus
+        """
+        if workers is not None and not (isinstance(workers, int) and workers > 0):
+            raise ValueError('Workers must be a positive integer')
+
+        self.func = func
+        self.workers = min(workers or cpu_count(), swarm_size)
+
+        shape = (swarm_size, member_size)
+        dtype = numpy_dtype(dtype)
+        nbytes = swarm_size * member_size * dtype.itemsize
+        self._blocks = list([SharedMemory(create=True, size=nbytes),
+                             SharedMemory(create=True, size=nbytes),
+                             SharedMemory(create=True, size=swarm_size * numpy_dtype(float64).itemsize)])
+        self.pos = ndarray(shape, dtype=dtype, buffer=self._blocks[0].buf)
+        self.vel = ndarray(shape, dtype=dtype, buffer=self._blocks[1].buf)
+        self.scores = ndarray(swarm_size, dtype=float64, buffer=self._blocks[2].buf)
+
+        self._begin = Barrier(self.workers + 1)
+        self._end = Barrier(self.workers + 1)
+        self._done = Value('b', 0)
+        self._errors = SimpleQueue()
+        bounds = linspace(0, swarm_size, self.workers + 1).astype(int)
+        self._processes = list([Process(target=_evaluate_rows,
+                                        args=(func, self._blocks[0].name, self._blocks[2].name, shape, dtype,
+                                              int(bounds[i]), int(bounds[i + 1]), self._begin, self._end,
+                                              self._done, self._errors))
+                                for i in range(self.workers)])
+        for x in self._processes:
+            x.daemon = True
+            x.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if args[2] is not None:
+            clear_frames(args[2])
+        self.close()
+
+    def __getstate__(self):
+        return {'func': self.func, 'workers': self.workers, '_processes': [], '_blocks': []}
+
+    @property
+    def parallel(self):
+        """
+        Whether or not map evaluates the shared position matrix in worker processes
+        """
+        return bool(self._processes)
+
+    def map(self, members):
+        """
+        Evaluates func over members, in the worker processes when members is the shared position matrix
+
+        :param members: position matrix, one member per row
+        :return: array of values, where ith value belongs to ith row
+        """
+        if members is not self.pos or not self._processes:
+            return list([self.func(x) for x in members])
+        try:
+            self._begin.wait()
+            self._end.wait()
+        except BrokenBarrierError:
+            error = None if self._errors.empty() else self._errors.get()
+            raise error or RuntimeError('Shared memory swarm evaluation failed in a worker process')
+        return self.scores.copy()
+
+    def close(self):
+        """
+        Stops the worker processes and releases the shared memory blocks -
+        views of pos, vel and scores held elsewhere must be dropped first, which on leaving
+        a with block by an error includes the locals of the frames it was raised through
+
+        :return: None
+        """
+        if self._processes:
+            self._done.value = 1
+            try:
+                self._begin.wait(timeout=1)
+            except BrokenBarrierError:
+                pass
+            for x in self._processes:
+                x.join(timeout=1)
+                if x.is_alive():
+                    x.terminate()
+            self._processes = []
+        if self._blocks:
+            self.pos = self.vel = self.scores = None
+            for x in self._blocks:
+                x.close()
+                x.unlink()
+            self._blocks = []
@@ -1,7 +1,11 @@
 from abc import ABCMeta, abstractmethod
-from copy import deepcopy
-from math import exp
+from functools import partial
+from math import exp, log, log1p
 from random import random
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.CopyStrategy import get_copy_strategy
+from Solid.MemoCache import MemoCache
+from Solid.RunStats import RunStats
 
 
 class SimulatedAnnealing:
@@ -24,35 +28,109 @@ class SimulatedAnnealing:
     start_temp = None
     current_temp = None
     adjust_temp = None
+    auto_temp = None
+
+    acceptance_rate = None
+    stagnant_steps = None
+    reheat_steps = None
+    reheat_temp = None
+
+    moves = None
+
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_neighbor', '_energy', '_propose_move', '_delta_energy', '_apply_move', '_copy',
+                   'adjust_temp')
+    copy_strategy = None
+
+    def _cool_exponential(self, schedule_constant):
+        self.current_temp *= schedule_constant
+
+    def _cool_linear(self, schedule_constant):
+        self.current_temp -= schedule_constant
 
     def _exponential(self, schedule_constant):
-        def f():
-            self.current_temp *= schedule_constant
-        return f
+        return partial(self._cool_exponential, schedule_constant)
 
     def _linear(self, schedule_constant):
-        def f():
-            self.current_temp -= schedule_constant
-        return f
+        return partial(self._cool_linear, schedule_constant)
+
+    def _cool_lundy_mees(self, schedule_constant):
+        self.current_temp /= 1 + schedule_constant * self.current_temp
+
+    def _lundy_mees(self, schedule_constant):
+        return partial(self._cool_lundy_mees, schedule_constant)
+
+    def _cool_logarithmic(self, schedule_constant):
+        # steps T(k) = T0 / (1 + c * log(1 + k)) on from the k at which T(k) is the current temperature,
+        # so the schedule continues from a reheated or swapped temperature instead of restarting
+        if schedule_constant > 0:
+            ratio = self.start_temp / self.current_temp
+            step = schedule_constant * log1p(exp((1 - ratio) / schedule_constant))
+            self.current_temp = self.start_temp / (ratio + step)
+
+    def _logarithmic(self, schedule_constant):
+        return partial(self._cool_logarithmic, schedule_constant)
+
+    def _cool_adaptive(self, schedule_constant):
+        progress = float(self.cur_steps) / self.max_steps
+        if progress < .15:
+            target = .44 + .56 * 560 ** (-progress / .15)
+        elif progress < .65:
+            target = .44
+        else:
+            target = .44 * 440 ** (-(progress - .65) / .35)
+        if self.acceptance_rate > target:
+            self.current_temp *= schedule_constant
+        else:
+            self.current_temp /= schedule_constant
+
+    def _adaptive(self, schedule_constant):
+        return partial(self._cool_adaptive, schedule_constant)
+
+    def _reheating(self, schedule):
+        if self.stagnant_steps >= self.reheat_steps:
+            self._reheat()
+        else:
+            schedule()
 
     def _get_schedule(self, schedule_str, schedule_constant):
         if schedule_str == 'exponential':
             return self._exponential(schedule_constant)
         elif schedule_str == 'linear':
             return self._linear(schedule_constant)
+        elif schedule_str == 'lundy_mees':
+            return self._lundy_mees(schedule_constant)
+        elif schedule_str == 'logarithmic':
+            return self._logarithmic(schedule_constant)
+        elif schedule_str == 'adaptive':
+            return self._adaptive(schedule_constant)
         else:
-            raise ValueError('Annealing schedule must be either "exponential" or "linear"')
+            raise ValueError('Annealing schedule must be "exponential", "linear", "lundy_mees", '
+                             '"logarithmic" or "adaptive"')
 
     def __init__(self, initial_state, temp_begin, schedule_constant, max_steps,
-                 min_energy=None, schedule='exponential'):
+                 min_energy=None, schedule='exponential',
+                 cache_size=None, cache_key=None, copy='deepcopy', moves=False, reheat_steps=None):
         """
 
         :param initial_state: initial state of annealing algorithm
         :param max_steps: maximum number of iterations to conduct annealing for
-        :param temp_begin: beginning temperature
+        :param temp_begin: beginning temperature, or 'auto' to estimate it from sampled energy deltas
         :param schedule_constant: constant value in annealing schedule function
         :param min_energy: energy value to stop algorithm once reached
-        :param schedule: 'exponential' or 'linear' annealing schedule
+        :param schedule: 'exponential', 'linear', 'lundy_mees', 'logarithmic' or 'adaptive' annealing schedule -
+                         'adaptive' cools by schedule_constant while the acceptance rate is above a target
+                         falling over the run and heats by it otherwise
+        :param cache_size: number of energy values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param copy: 'deepcopy', 'shallow', 'array' or 'none' strategy used to copy states
+        :param moves: indicates whether or not to change the current state in place through
+                      _propose_move and _apply_move instead of replacing it with _neighbor -
+                      _undo_move must be overridden as well unless _delta_energy is
+        :param reheat_steps: number of steps without improving the best energy after which the temperature is
+                             reset to the one at which it last improved, None disables reheating
         """
         self.initial_state = initial_state
 
@@ -67,13 +145,39 @@ class SimulatedAnnealing:
             else:
                 raise ValueError('Minimum energy must be a numeric type')
 
-        if isinstance(temp_begin, (float, int)):
+        if temp_begin == 'auto':
+            self.auto_temp = True
+        elif isinstance(temp_begin, (float, int)):
             self.start_temp = float(temp_begin)
+            self.auto_temp = False
         else:
-            raise ValueError('Starting temperature must be a numeric type')
+            raise ValueError('Starting temperature must be a numeric type or "auto"')
 
         self.adjust_temp = self._get_schedule(schedule, schedule_constant)
 
+        if reheat_steps is not None:
+            if isinstance(reheat_steps, int) and reheat_steps > 0:
+                self.reheat_steps = reheat_steps
+                self.adjust_temp = partial(self._reheating, self.adjust_temp)
+            else:
+                raise ValueError('Reheat steps must be a positive integer')
+
+        self.copy_strategy = get_copy_strategy(copy)
+
+        self.moves = bool(moves)
+
+        if self.moves:
+            hooks = ['_propose_move', '_apply_move']
+            if type(self)._delta_energy == SimulatedAnnealing._delta_energy:
+                hooks.append('_undo_move')
+            missing = list([x for x in hooks if getattr(type(self), x) == getattr(SimulatedAnnealing, x)])
+            if missing:
+                raise ValueError('Move-based annealing requires overriding %s' % ', '.join(missing))
+
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._energy, self), cache_size, cache_key)
+            self._energy = self.cache
+
     def __str__(self):
         return ('SIMULATED ANNEALING: \n' +
                 'CURRENT STEPS: %d \n' +
@@ -96,6 +200,9 @@ class SimulatedAnnealing:
         self.best_state = None
         self.current_energy = None
         self.best_energy = None
+        self.acceptance_rate = .5
+        self.stagnant_steps = 0
+        self.reheat_temp = None
 
     @abstractmethod
     def _neighbor(self):
@@ -116,53 +223,192 @@ class SimulatedAnnealing:
         """
         pass
 
-    def _accept_neighbor(self, neighbor):
+    def _copy(self, state):
+        """
+        Copies a state using the copy strategy chosen in the constructor -
+        override with a faster copy for large states
+
+        :param state: a state
+        :return: copy of state
+        """
+        return self.copy_strategy(state)
+
+    def _propose_move(self):
+        """
+        Returns a random move from the current state, used instead of _neighbor when moves are enabled
+
+        :return: a move, given access to self.current_state
+        """
+        pass
+
+    def _apply_move(self, move):
+        """
+        Applies a move to self.current_state in place
+
+        :param move: a move returned by _propose_move
+        :return: None
+        """
+        pass
+
+    def _undo_move(self, move):
+        """
+        Reverts a move previously applied to self.current_state in place
+
+        :param move: a move passed to _apply_move
+        :return: None
+        """
+        pass
+
+    def _delta_energy(self, move):
         """
-        Probabilistically determines whether or not to accept a transition to a neighbor
+        Finds the change in energy a move would cause, without changing the current state -
+        override with an incremental computation, by default the move is applied and undone
 
-        :param neighbor: a state
+        :param move: a move returned by _propose_move
+        :return: energy after move minus current energy
+        """
+        self._apply_move(move)
+        try:
+            return self._energy(self.current_state) - self.current_energy
+        finally:
+            self._undo_move(move)
+
+    def _accept_delta(self, delta):
+        """
+        Probabilistically determines whether or not to accept a transition changing energy by delta
+
+        :param delta: energy of new state minus energy of current state
         :return: boolean indicating whether or not transition is accepted
         """
         try:
-            p = exp(-(self._energy(neighbor) - self._energy(self.current_state)) / self.current_temp)
+            p = exp(-delta / self.current_temp)
         except OverflowError:
             return True
         return True if p >= 1 else p >= random()
 
-    def run(self, verbose=True):
+    def _sample_deltas(self, n):
         """
-        Conducts simulated annealing
+        Samples energy changes of random transitions from the current state
 
-        :param verbose: indicates whether or not to print progress regularly
-        :return: best state and best energy
+        :param n: number of transitions to sample
+        :return: list of energy changes
         """
-        self._clear()
-        self.current_state = self.initial_state
-        self.current_temp = self.start_temp
-        self.best_energy = self._energy(self.current_state)
-        for i in range(self.max_steps):
-            self.cur_steps += 1
+        if self.moves:
+            return list([self._delta_energy(self._propose_move()) for _ in range(n)])
+        return list([self._energy(self._neighbor()) - self.current_energy for _ in range(n)])
+
+    def _estimate_temp(self, samples=100, acceptance=.8):
+        """
+        Estimates a starting temperature at which uphill transitions from the current state
+        are accepted with the given probability on average
 
-            if verbose and ((i + 1) % 100 == 0):
-                print(self)
+        :param samples: number of transitions to sample
+        :param acceptance: initial probability of accepting an uphill transition
+        :return: starting temperature
+        """
+        uphill = list([x for x in self._sample_deltas(samples) if x > 0])
+        if not uphill:
+            return 1.
+        return -sum(uphill) / len(uphill) / log(acceptance)
 
-            neighbor = self._neighbor()
+    def _initial_temp(self):
+        """
+        Returns the starting temperature, estimating it first when the temperature is 'auto'
+
+        :return: starting temperature
+        """
+        if self.auto_temp:
+            self.start_temp = float(self._estimate_temp())
+        return self.start_temp
+
+    def _reheat(self):
+        """
+        Raises the temperature back to the one at which the best energy last improved after it has
+        stagnated - a temperature that is already higher is kept
+
+        :return: None
+        """
+        temp = self.start_temp if self.reheat_temp is None else self.reheat_temp
+        if temp > self.current_temp:
+            self.current_temp = temp
+        self.stagnant_steps = 0
+
+    def _initialize(self):
+        """
+        Starts annealing from the initial state at the starting temperature
+
+        :return: None
+        """
+        self.current_state = self._copy(self.initial_state) if self.moves else self.initial_state
+        self.current_energy = self.best_energy = self._energy(self.current_state)
+        self.best_state = self._copy(self.current_state)
+        self.current_temp = self._initial_temp()
+
+    def _step(self):
+        """
+        Proposes and probabilistically accepts one transition at the current temperature,
+        keeping the current energy and acceptance rate as running values, and updates the best state
 
-            if self._accept_neighbor(neighbor):
+        :return: None
+        """
+        if self.moves:
+            move = self._propose_move()
+            delta = self._delta_energy(move)
+            accepted = self._accept_delta(delta)
+            if accepted:
+                self._apply_move(move)
+                self.current_energy += delta
+        else:
+            neighbor = self._neighbor()
+            energy = self._energy(neighbor)
+            accepted = self._accept_delta(energy - self.current_energy)
+            if accepted:
                 self.current_state = neighbor
-            self.current_energy = self._energy(self.current_state)
+                self.current_energy = energy
+        self.acceptance_rate += (accepted - self.acceptance_rate) / 500.
+
+        if self.current_energy < self.best_energy:
+            self.best_energy = self.current_energy
+            self.best_state = self._copy(self.current_state)
+            self.stagnant_steps = 0
+            self.reheat_temp = self.current_temp
+        else:
+            self.stagnant_steps += 1
 
-            if self.current_energy < self.best_energy:
-                self.best_energy = self.current_energy
-                self.best_state = deepcopy(self.current_state)
+    def run(self, verbose=True, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        """
+        Conducts simulated annealing
 
-            if self.min_energy is not None and self.current_energy < self.min_energy:
-                print("TERMINATING - REACHED MINIMUM ENERGY")
+        :param verbose: indicates whether or not to print progress regularly
+        :param max_evaluations: maximum number of energy evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
+        :return: best state and best energy
+        """
+        self._clear()
+        with Budget(self, ['_energy', '_delta_energy'], [], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._initialize()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if verbose and ((i + 1) % 100 == 0):
+                        print(self)
+
+                    self._step()
+
+                    if self.min_energy is not None and self.current_energy < self.min_energy:
+                        print("TERMINATING - REACHED MINIMUM ENERGY")
+                        return self.best_state, self.best_energy
+
+                    self.adjust_temp()
+                    if self.current_temp < 0.000001:
+                        print("TERMINATING - REACHED TEMPERATURE OF 0")
+                        return self.best_state, self.best_energy
+                print("TERMINATING - REACHED MAXIMUM STEPS")
                 return self.best_state, self.best_energy
-
-            self.adjust_temp()
-            if self.current_temp < 0.000001:
-                print("TERMINATING - REACHED TEMPERATURE OF 0")
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
                 return self.best_state, self.best_energy
-        print("TERMINATING - REACHED MAXIMUM STEPS")
-        return self.best_state, self.best_energy
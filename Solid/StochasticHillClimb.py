@@ -1,7 +1,33 @@
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from functools import partial
 from math import exp
-from random import random
+from random import getrandbits, random, seed as random_seed
+from numpy.random import seed as numpy_seed
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.CopyStrategy import get_copy_strategy
+from Solid.MemoCache import MemoCache
+from Solid.ParallelEvaluator import ParallelEvaluator
+from Solid.RunStats import RunStats
+
+
+def _climb(climber, start):
+    """
+    Runs one climb of a multi-start hill climb from a given initial state, on a copy of the
+    climber so that climbs sharing it, such as on a thread pool, stay independent
+
+    :param climber: a stochastic hill climb
+    :param start: initial state and seed for random number generators, None leaves them unseeded
+    :return: best state and best objective function value of the climb
+    """
+    initial_state, seed = start
+    if seed is not None:
+        random_seed(seed)
+        numpy_seed(seed)
+    climber = deepcopy(climber)
+    climber.initial_state = initial_state
+    return climber.run(verbose=False)
 
 
 class StochasticHillClimb:
@@ -17,18 +43,29 @@ class StochasticHillClimb:
     cur_steps = 0
     max_steps = None
 
+    current_objective = None
     best_objective = None
     max_objective = None
 
     temp = None
 
-    def __init__(self, initial_state, temp, max_steps, max_objective=None):
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_neighbor', '_objective', '_copy')
+    copy_strategy = None
+
+    def __init__(self, initial_state, temp, max_steps, max_objective=None,
+                 cache_size=None, cache_key=None, copy='deepcopy'):
         """
 
         :param initial_state: initial state of hill climbing
         :param max_steps: maximum steps to run hill climbing for
         :param temp: temperature in probabilistic acceptance of transition
         :param max_objective: objective function to stop algorithm once reached
+        :param cache_size: number of objective values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param copy: 'deepcopy', 'shallow', 'array' or 'none' strategy used to copy states
         """
         self.initial_state = initial_state
 
@@ -48,6 +85,12 @@ class StochasticHillClimb:
         else:
             raise ValueError('Temperature must be a numeric type')
 
+        self.copy_strategy = get_copy_strategy(copy)
+
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._objective, self), cache_size, cache_key)
+            self._objective = self.cache
+
     def __str__(self):
         return ('STOCHASTIC HILL CLIMB: \n' +
                 'CURRENT STEPS: %d \n' +
@@ -67,6 +110,7 @@ class StochasticHillClimb:
         self.cur_steps = 0
         self.current_state = None
         self.best_state = None
+        self.current_objective = None
         self.best_objective = None
 
     @abstractmethod
@@ -88,45 +132,108 @@ class StochasticHillClimb:
         """
         pass
 
-    def _accept_neighbor(self, neighbor):
+    def _copy(self, state):
         """
-        Probabilistically determines whether or not to accept a transition to a neighbor
+        Copies a state using the copy strategy chosen in the constructor -
+        override with a faster copy for large states
 
-        :param neighbor: a state
+        :param state: a state
+        :return: copy of state
+        """
+        return self.copy_strategy(state)
+
+    def _accept_delta(self, delta):
+        """
+        Probabilistically determines whether or not to accept a transition changing the objective by delta
+
+        :param delta: objective of neighbor minus objective of current state
         :return: boolean indicating whether or not transition was accepted
         """
         try:
-            p = 1. / (1 + (exp((self._objective(self.current_state) - self._objective(neighbor)) / self.temp)))
+            p = 1. / (1 + (exp(-delta / self.temp)))
         except OverflowError:
-            return True
+            return False
         return True if p >= 1 else p >= random()
 
-    def run(self, verbose=True):
+    def _initialize(self):
         """
-        Conducts hill climb
+        Starts climbing from the initial state, which is also the first best state
 
-        :param verbose: indicates whether or not to print progress regularly
-        :return: best state and best objective function value
+        :return: None
         """
-        self._clear()
         self.current_state = self.initial_state
-        for i in range(self.max_steps):
-            self.cur_steps += 1
+        self.current_objective = self.best_objective = self._objective(self.current_state)
+        self.best_state = self._copy(self.current_state)
 
-            if ((i + 1) % 100 == 0) and verbose:
-                print(self)
+    def _step(self):
+        """
+        Proposes and probabilistically accepts one transition, evaluating only the neighbor
+        since the objective of the current state is kept, and updates the best state
 
-            neighbor = self._neighbor()
+        :return: None
+        """
+        neighbor = self._neighbor()
+        objective = self._objective(neighbor)
+        if self._accept_delta(objective - self.current_objective):
+            self.current_state = neighbor
+            self.current_objective = objective
 
-            if self._accept_neighbor(neighbor):
-                self.current_state = neighbor
+            if self.current_objective > self.best_objective:
+                self.best_objective = self.current_objective
+                self.best_state = self._copy(self.current_state)
 
-            if self._objective(self.current_state) > (self.best_objective or 0):
-                self.best_objective = self._objective(self.current_state)
-                self.best_state = deepcopy(self.current_state)
+    def run(self, verbose=True, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        """
+        Conducts hill climb
 
-            if self.max_objective is not None and (self.best_objective or 0) > self.max_objective:
-                print("TERMINATING - REACHED MAXIMUM OBJECTIVE")
+        :param verbose: indicates whether or not to print progress regularly
+        :param max_evaluations: maximum number of objective function evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
+        :return: best state and best objective function value
+        """
+        self._clear()
+        with Budget(self, ['_objective'], [], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._initialize()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if ((i + 1) % 100 == 0) and verbose:
+                        print(self)
+
+                    self._step()
+
+                    if self.max_objective is not None and self.best_objective > self.max_objective:
+                        print("TERMINATING - REACHED MAXIMUM OBJECTIVE")
+                        return self.best_state, self.best_objective
+                print("TERMINATING - REACHED MAXIMUM STEPS")
                 return self.best_state, self.best_objective
-        print("TERMINATING - REACHED MAXIMUM STEPS")
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
+                return self.best_state, self.best_objective
+
+    def run_multi_start(self, initial_states, workers=None, executor=None):
+        """
+        Conducts independent hill climbs from each of several initial states and keeps the best,
+        seeding each climb differently when climbs run in separate processes
+
+        :param initial_states: list of initial states, one per climb
+        :param workers: number of processes to run climbs on, None runs them serially
+        :param executor: concurrent.futures executor to run climbs on instead of spawning a pool
+        :return: best state and best objective function value across all climbs
+        """
+        if (workers is None and executor is None) or (executor is not None and
+                                                       not isinstance(executor, ProcessPoolExecutor)):
+            seeds = [None] * len(initial_states)
+        else:
+            seeds = list([getrandbits(32) for _ in initial_states])
+        with ParallelEvaluator(partial(_climb, self), workers, executor) as evaluator:
+            results = evaluator.map(list(zip(initial_states, seeds)))
+        self.best_state, self.best_objective = results[0]
+        for best_state, best_objective in results[1:]:
+            if best_objective > self.best_objective:
+                self.best_state, self.best_objective = best_state, best_objective
         return self.best_state, self.best_objective
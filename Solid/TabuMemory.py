@@ -0,0 +1,67 @@
+from collections import deque
+from Solid.MemoCache import default_key
+
+
+class TabuMemory:
+    """
+    Fixed-size first-in first-out tabu list with constant time membership tests,
+    storing a hashable key of each state rather than the state itself
+    """
+    max_size = None
+    key = None
+
+    def __init__(self, max_size, key=None):
+        """
+
+        :param max_size: number of states to remember before forgetting the oldest
+        :param key: function mapping a state to a hashable key or fingerprint, defaults to default_key
+        """
+        if isinstance(max_size, int) and max_size > 0:
+            self.max_size = max_size
+        else:
+            raise ValueError('Tabu memory size must be a positive integer')
+
+        if key is None:
+            self.key = default_key
+        elif callable(key):
+            self.key = key
+        else:
+            raise ValueError('Tabu memory key must be callable')
+
+        self._order = deque()
+        self._counts = {}
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __contains__(self, state):
+        return self.key(state) in self._counts
+
+    def append(self, state):
+        """
+        Remembers a state, forgetting the oldest remembered state if full
+
+        :param state: a state
+        :return: None
+        """
+        if len(self._order) >= self.max_size:
+            oldest = self._order.popleft()
+            if self._counts[oldest] == 1:
+                del self._counts[oldest]
+            else:
+                self._counts[oldest] -= 1
+        k = self.key(state)
+        self._order.append(k)
+        self._counts[k] = self._counts.get(k, 0) + 1
+
+    def clear(self):
+        """
+        Forgets all states
+
+        :return: None
+        """
+        self._order.clear()
+        self._counts.clear()
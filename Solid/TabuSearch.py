@@ -1,7 +1,14 @@
 from abc import ABCMeta, abstractmethod
-from copy import deepcopy
-from collections import deque
-from numpy import argmax
+from functools import partial
+from itertools import islice
+from random import sample
+from numpy import argsort, asarray
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.CopyStrategy import get_copy_strategy
+from Solid.MemoCache import MemoCache, default_key
+from Solid.ParallelEvaluator import HookTask, ParallelEvaluator
+from Solid.RunStats import RunStats
+from Solid.TabuMemory import TabuMemory
 
 
 class TabuSearch:
@@ -14,21 +21,45 @@ class TabuSearch:
 
     tabu_size = None
     tabu_list = None
+    fingerprint = None
+
+    candidates = None
+    sample_size = None
 
     initial_state = None
     current = None
+    current_score = None
     best = None
+    best_score = None
 
     max_steps = None
     max_score = None
 
-    def __init__(self, initial_state, tabu_size, max_steps, max_score=None):
+    cache = None
+    budget = None
+    stats = None
+    timed_hooks = ('_neighborhood', '_score', '_score_batch', '_rank', '_copy')
+    run_state = ('tabu_list',)
+    evaluator = None
+    copy_strategy = None
+
+    def __init__(self, initial_state, tabu_size, max_steps, max_score=None,
+                 cache_size=None, cache_key=None, copy='deepcopy', fingerprint=False,
+                 candidates='all', sample_size=None):
         """
 
-        :param initial_state: initial state, should implement __eq__ or __cmp__
+        :param initial_state: initial state, should be hashable or a list, tuple or numpy array
         :param tabu_size: number of states to keep in tabu list
         :param max_steps: maximum number of steps to run algorithm for
         :param max_score: score to stop algorithm once reached
+        :param cache_size: number of score values to memoize, None disables caching
+        :param cache_key: function mapping a member to a hashable cache key
+        :param copy: 'deepcopy', 'shallow', 'array' or 'none' strategy used to copy states
+        :param fingerprint: indicates whether or not to keep only the _hash of states in the tabu list
+        :param candidates: 'all' to score the whole neighborhood, 'first_improvement' to move to the first
+                           admissible neighbor improving on the current state, or 'sample' to score sample_size neighbors
+        :param sample_size: number of neighbors scored per step by the 'sample' candidate strategy -
+                            generator neighborhoods should also implement _neighborhood_size
         """
         self.initial_state = initial_state
 
@@ -48,12 +79,31 @@ class TabuSearch:
             else:
                 raise TypeError('Maximum score must be a numeric type')
 
+        self.copy_strategy = get_copy_strategy(copy)
+
+        self.fingerprint = bool(fingerprint)
+
+        if candidates in ('all', 'first_improvement', 'sample'):
+            self.candidates = candidates
+        else:
+            raise TypeError('Candidates must be "all", "first_improvement" or "sample"')
+
+        if candidates == 'sample':
+            if isinstance(sample_size, int) and sample_size > 0:
+                self.sample_size = sample_size
+            else:
+                raise TypeError('Sample size must be a positive integer')
+
+        if cache_size is not None:
+            self.cache = MemoCache(partial(type(self)._score, self), cache_size, cache_key)
+            self._score = self.cache
+
     def __str__(self):
         return ('TABU SEARCH: \n' +
                 'CURRENT STEPS: %d \n' +
                 'BEST SCORE: %f \n' +
                 'BEST MEMBER: %s \n\n') % \
-               (self.cur_steps, self._score(self.best), str(self.best))
+               (self.cur_steps, self.best_score, str(self.best))
 
     def __repr__(self):
         return self.__str__()
@@ -65,9 +115,10 @@ class TabuSearch:
         :return: None
         """
         self.cur_steps = 0
-        self.tabu_list = deque(maxlen=self.tabu_size)
+        self.tabu_list = TabuMemory(self.tabu_size, self._hash if self.fingerprint else None)
         self.current = self.initial_state
         self.best = self.initial_state
+        self.current_score = self.best_score = self._score(self.initial_state)
 
     @abstractmethod
     def _score(self, state):
@@ -82,59 +133,188 @@ class TabuSearch:
     @abstractmethod
     def _neighborhood(self):
         """
-        Returns list of all members of neighborhood of current state, given self.current
+        Returns members of neighborhood of current state, given self.current -
+        may be a generator, which the 'first_improvement' and 'sample' candidate strategies consume lazily
 
-        :return: list of members of neighborhood
+        :return: list or iterable of members of neighborhood
         """
         pass
 
-    def _best(self, neighborhood):
+    def _neighborhood_size(self):
+        """
+        Returns the number of members a generator returned by _neighborhood yields, letting the
+        'sample' candidate strategy draw from all of them - None when unknown, in which case the
+        generator must yield members in random order, as only the first sample_size are drawn
+
+        :return: number of members of neighborhood of current state, or None
+        """
+        return None
+
+    def _hash(self, state):
+        """
+        Returns a compact fingerprint of a state, kept in the tabu list instead of the state
+        when fingerprinting is enabled - override with a problem-specific hash
+
+        :param state: a state
+        :return: hashable fingerprint of state
+        """
+        return hash(default_key(state))
+
+    def _copy(self, state):
+        """
+        Copies a state using the copy strategy chosen in the constructor -
+        override with a faster copy for large states
+
+        :param state: a state
+        :return: copy of state
+        """
+        return self.copy_strategy(state)
+
+    def _score_batch(self, neighborhood):
+        """
+        Scores every member of a neighborhood once - override with a vectorized
+        implementation to replace the per-member calls to _score
+
+        :param neighborhood: list of members of neighborhood
+        :return: sequence of scores, where ith score belongs to ith member of neighborhood
         """
-        Finds the best member of a neighborhood
+        if self.evaluator is not None and self.evaluator.parallel:
+            return self.evaluator.map(neighborhood)
+        return [self._score(x) for x in neighborhood]
 
-        :param neighborhood: a neighborhood
-        :return: best member of neighborhood
+    def _rank(self, neighborhood):
         """
-        return neighborhood[argmax([self._score(x) for x in neighborhood])]
+        Scores a neighborhood once and orders it from best to worst, keeping earlier members first on ties
 
-    def run(self, verbose=True):
+        :param neighborhood: list of members of neighborhood
+        :return: scores of members and array of indices of members from best to worst
+        """
+        scores = asarray(self._score_batch(neighborhood), dtype=float)
+        return scores, argsort(-scores, kind='stable')
+
+    def _accept(self, candidate, score, tabu):
+        """
+        Moves to a non-tabu candidate, or takes a tabu candidate as best by aspiration
+
+        :param candidate: a member of neighborhood
+        :param score: score of candidate
+        :param tabu: indicates whether or not candidate is in the tabu list
+        :return: None
+        """
+        self.tabu_list.append(candidate)
+        if tabu:
+            self.best = self._copy(candidate)
+            self.best_score = score
+        else:
+            self.current = candidate
+            self.current_score = score
+            if self.current_score > self.best_score:
+                self.best = self._copy(self.current)
+                self.best_score = self.current_score
+
+    def _best_admissible(self, neighborhood):
+        """
+        Scores a whole neighborhood and accepts its best candidate that is not tabu or satisfies aspiration
+
+        :param neighborhood: list of members of neighborhood
+        :return: boolean indicating whether or not a candidate was accepted
+        """
+        tabu = list([x in self.tabu_list for x in neighborhood])
+        if all(tabu):
+            return False
+        scores, order = self._rank(neighborhood)
+        for i in order:
+            if not tabu[i] or scores[i] > self.best_score:
+                self._accept(neighborhood[i], scores[i], tabu[i])
+                return True
+        return False
+
+    def _first_improvement(self, neighborhood):
+        """
+        Scores neighbors one at a time, accepting the first admissible neighbor that improves on the
+        current state, or else the best admissible neighbor once the neighborhood is exhausted
+
+        :param neighborhood: finite iterable of members of neighborhood
+        :return: boolean indicating whether or not a candidate was accepted
+        """
+        fallback = None
+        for x in neighborhood:
+            tabu = x in self.tabu_list
+            score = self._score(x)
+            if tabu and not score > self.best_score:
+                continue
+            if score > self.current_score:
+                self._accept(x, score, tabu)
+                return True
+            if fallback is None or score > fallback[1]:
+                fallback = (x, score, tabu)
+        if fallback is None:
+            return False
+        self._accept(*fallback)
+        return True
+
+    def _sample(self, neighborhood):
+        """
+        Draws sample_size candidates from a neighborhood at random - a generator is advanced past
+        the members between randomly drawn positions when _neighborhood_size is known, otherwise
+        its first members are taken
+
+        :param neighborhood: list or iterable of members of neighborhood
+        :return: list of candidates
+        """
+        if isinstance(neighborhood, list):
+            return sample(neighborhood, min(self.sample_size, len(neighborhood)))
+        size = self._neighborhood_size()
+        if size is None:
+            return list(islice(neighborhood, self.sample_size))
+        res = []
+        position = 0
+        for i in sorted(sample(range(size), min(self.sample_size, size))):
+            res.extend(islice(neighborhood, i - position, i - position + 1))
+            position = i + 1
+        return res
+
+    def run(self, verbose=True, workers=None, executor=None, max_evaluations=None, time_limit=None, stats=False, profile=False):
         """
         Conducts tabu search
 
         :param verbose: indicates whether or not to print progress regularly
+        :param workers: number of processes to score neighborhoods on, None scores serially
+        :param executor: concurrent.futures executor to score neighborhoods on instead of spawning a pool
+        :param max_evaluations: maximum number of score evaluations, None for no limit
+        :param time_limit: maximum number of seconds to run for, None for no limit
+        :param stats: indicates whether or not to count evaluations and time hooks in self.stats
+        :param profile: indicates whether or not to capture a cProfile profile of the run in self.stats
         :return: best state and objective function value of best state
         """
-        self._clear()
-        for i in range(self.max_steps):
-            self.cur_steps += 1
-
-            if ((i + 1) % 100 == 0) and verbose:
-                print(self)
-
-            neighborhood = self._neighborhood()
-            neighborhood_best = self._best(neighborhood)
-
-            while True:
-                if all([x in self.tabu_list for x in neighborhood]):
-                    print("TERMINATING - NO SUITABLE NEIGHBORS")
-                    return self.best, self._score(self.best)
-                if neighborhood_best in self.tabu_list:
-                    if self._score(neighborhood_best) > self._score(self.best):
-                        self.tabu_list.append(neighborhood_best)
-                        self.best = deepcopy(neighborhood_best)
-                        break
+        with ParallelEvaluator(HookTask(self, '_score'), workers, executor) as self.evaluator, \
+                Budget(self, ['_score'], ['_score_batch'], max_evaluations, time_limit, stats) as self.budget, \
+                RunStats(self, self.budget, self.timed_hooks, stats, profile) as self.stats:
+            try:
+                self._clear()
+                for i in range(self.max_steps):
+                    self.cur_steps += 1
+
+                    if ((i + 1) % 100 == 0) and verbose:
+                        print(self)
+
+                    neighborhood = self._neighborhood()
+                    if self.candidates == 'first_improvement':
+                        moved = self._first_improvement(neighborhood)
+                    elif self.candidates == 'sample':
+                        moved = self._best_admissible(self._sample(neighborhood))
                     else:
-                        neighborhood.remove(neighborhood_best)
-                        neighborhood_best = self._best(neighborhood)
-                else:
-                    self.tabu_list.append(neighborhood_best)
-                    self.current = neighborhood_best
-                    if self._score(self.current) > self._score(self.best):
-                        self.best = deepcopy(self.current)
-                    break
-
-            if self.max_score is not None and self._score(self.best) > self.max_score:
-                print("TERMINATING - REACHED MAXIMUM SCORE")
-                return self.best, self._score(self.best)
-        print("TERMINATING - REACHED MAXIMUM STEPS")
-        return self.best, self._score(self.best)
+                        moved = self._best_admissible(list(neighborhood))
+
+                    if not moved:
+                        print("TERMINATING - NO SUITABLE NEIGHBORS")
+                        return self.best, self.best_score
+
+                    if self.max_score is not None and self.best_score > self.max_score:
+                        print("TERMINATING - REACHED MAXIMUM SCORE")
+                        return self.best, self.best_score
+                print("TERMINATING - REACHED MAXIMUM STEPS")
+                return self.best, self.best_score
+            except BudgetExhausted as e:
+                print("TERMINATING - %s" % e)
+                return self.best, self.best_score
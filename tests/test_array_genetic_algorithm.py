@@ -0,0 +1,60 @@
+from numpy import array, packbits
+from numpy.random import randint
+from Solid.ArrayGeneticAlgorithm import ArrayGeneticAlgorithm
+
+
+class Algorithm(ArrayGeneticAlgorithm):
+    """
+    Tries to get a randomly-generated bit string of length 100 to all ones
+    """
+    def _initial_population(self):
+        return randint(0, 2, (50, 100))
+
+    def _fitness(self, member):
+        return float(member.sum())
+
+
+def test_algorithm():
+    algorithm = Algorithm(.5, .7, 200, max_fitness=None)
+    best_member, best_fitness = algorithm.run()
+    assert best_fitness == best_member.sum()
+    assert best_member.shape == (100,)
+
+
+def test_packed():
+    for crossover in ['one_point', 'uniform']:
+        algorithm = Algorithm(.5, .7, 200, max_fitness=None, crossover=crossover, packed=True)
+        best_member, best_fitness = algorithm.run()
+        assert algorithm.population.shape == (50, 13)
+        assert best_fitness == best_member.sum()
+
+
+def test_packed_one_point_crossover():
+    algorithm = Algorithm(.5, .7, 200, max_fitness=None, packed=True)
+    algorithm.genome_size = 20
+    ones = packbits(array([[1] * 20] * 200, dtype='uint8'), axis=1)
+    zeros = packbits(array([[0] * 20] * 200, dtype='uint8'), axis=1)
+    for child in algorithm._crossover_batch(ones, zeros):
+        bits = list(algorithm._member(child))
+        point = bits.count(1)
+        assert bits == [1] * point + [0] * (20 - point)
+
+
+class FlatAlgorithm(Algorithm):
+    """
+    Scores every member zero, leaving roulette selection nothing to weigh
+    """
+    def _fitness(self, member):
+        return 0.
+
+
+def test_zero_fitness():
+    algorithm = FlatAlgorithm(.5, .7, 20, max_fitness=None)
+    algorithm.run()
+    assert len(algorithm.population) == 50
+
+
+def test_workers():
+    algorithm = Algorithm(.5, .7, 20, max_fitness=None, packed=True, cache_size=100)
+    best_member, best_fitness = algorithm.run(workers=2)
+    assert best_fitness == best_member.sum()
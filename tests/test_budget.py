@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from random import uniform
+from time import sleep
+from Solid.Budget import Budget, BudgetExhausted
+from Solid.GeneticAlgorithm import GeneticAlgorithm
+from Solid.SimulatedAnnealing import SimulatedAnnealing
+from Solid.TabuSearch import TabuSearch
+from pytest import raises
+
+
+class Owner:
+    """
+    Exposes a single member hook and a batch hook calling it
+    """
+    calls = 0
+
+    def _f(self, x):
+        self.calls += 1
+        return x
+
+    def _f_batch(self, xs):
+        return list([self._f(x) for x in xs])
+
+
+def test_budget():
+    owner = Owner()
+    with Budget(owner, ['_f'], ['_f_batch'], max_evaluations=5) as budget:
+        owner._f(1)
+        owner._f_batch([1, 2, 3])
+        assert budget.evaluations == 4
+        try:
+            owner._f_batch([1, 2])
+            assert False
+        except BudgetExhausted:
+            assert owner.calls == 4
+    assert '_f' not in owner.__dict__ and '_f_batch' not in owner.__dict__
+
+
+class Annealing(SimulatedAnnealing):
+    """
+    Tries to get a randomly-generated list to match [.1, .2, .3, .2, .1]
+    """
+    def _neighbor(self):
+        return list([x + uniform(-.02, .02) for x in self.current_state])
+
+    def _energy(self, member):
+        return sum(abs(member[i] - [.1, .2, .3, .2, .1][i]) for i in range(5))
+
+
+class Genetic(GeneticAlgorithm):
+    """
+    Tries to get a randomly-generated list of bits to 000111
+    """
+    def _initial_population(self):
+        return list(list([int(uniform(0, 2)) for _ in range(6)]) for _ in range(50))
+
+    def _fitness(self, member):
+        return float(sum(member[i] == [0, 0, 0, 1, 1, 1][i] for i in range(6)))
+
+
+class Tabu(TabuSearch):
+    """
+    Walks the integers, sleeping on every evaluation
+    """
+    def _neighborhood(self):
+        return [self.current - 1, self.current + 1]
+
+    def _score(self, state):
+        sleep(.001)
+        return float(state)
+
+
+def test_max_evaluations():
+    algorithm = Annealing(list([uniform(0, 1) for _ in range(5)]), 5, .99, 5000)
+    best_state, best_energy = algorithm.run(max_evaluations=100)
+    assert algorithm.cur_steps == 100 and algorithm.budget.evaluations == 100
+    assert best_energy == Annealing._energy(algorithm, best_state)
+    assert '_energy' not in algorithm.__dict__
+
+    algorithm = Genetic(.5, .7, 500)
+    best_member, best_fitness = algorithm.run(max_evaluations=120)
+    assert algorithm.budget.evaluations <= 120
+    assert best_fitness == Genetic._fitness(algorithm, best_member)
+
+
+def test_time_limit():
+    algorithm = Tabu(0, 5, 100000)
+    best, best_score = algorithm.run(time_limit=.05)
+    assert algorithm.cur_steps < 100000 and best_score == float(best)
+
+
+def test_cache_hits_are_free():
+    algorithm = Tabu(0, 5, 1000, cache_size=100)
+    algorithm.run(max_evaluations=50)
+    assert 49 <= algorithm.budget.evaluations == algorithm.cache.misses <= 50
+    assert algorithm.cache.hits > 0
+
+
+
+class CountingGenetic(Genetic):
+    """
+    Records every fitness evaluation, from whichever thread makes it, sleeping so threads overlap
+    """
+    def _fitness(self, member):
+        self.calls.append(member)
+        sleep(.0005)
+        return Genetic._fitness(self, member)
+
+
+def test_thread_executor():
+    for cache_size in [None, 1000]:
+        algorithm = CountingGenetic(.5, .7, 500, cache_size=cache_size)
+        algorithm.calls = []
+        with ThreadPoolExecutor(4) as executor:
+            algorithm.run(verbose=False, executor=executor, max_evaluations=300)
+        assert len(algorithm.calls) <= algorithm.budget.evaluations <= 300
+        if cache_size is None:
+            assert len(algorithm.calls) == algorithm.budget.evaluations
+        else:
+            assert len(algorithm.calls) == algorithm.cache.misses
+
+
+
+def test_first_batch_over_budget():
+    algorithm = Genetic(.5, .7, 500)
+    with raises(ValueError):
+        algorithm.run(verbose=False, max_evaluations=10)
+    assert algorithm.budget.evaluations == 0
+    with ThreadPoolExecutor(2) as executor, raises(ValueError):
+        algorithm.run(verbose=False, executor=executor, max_evaluations=10)
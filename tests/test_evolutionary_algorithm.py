@@ -28,3 +28,26 @@ class Algorithm(EvolutionaryAlgorithm):
 def test_algorithm():
     algorithm = Algorithm(.5, .7, 500, max_fitness=None)
     algorithm.run()
+
+
+def test_selection():
+    for selection in ['roulette', 'stochastic_universal', 'tournament', 'rank']:
+        algorithm = Algorithm(.5, .7, 100, max_fitness=None, selection=selection, tournament_size=3)
+        algorithm.run()
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts fitness evaluations
+    """
+    calls = 0
+
+    def _fitness(self, member):
+        self.calls += 1
+        return Algorithm._fitness(self, member)
+
+
+def test_unchanged_members_are_not_rescored():
+    algorithm = CountingAlgorithm(.5, 0., 10, max_fitness=None)
+    algorithm.run()
+    assert algorithm.calls == 50 + 10 * 25
@@ -1,5 +1,11 @@
-from random import choice
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from multiprocessing import get_context
+from pickle import dumps, loads
+from random import choice, seed
 from Solid.GeneticAlgorithm import GeneticAlgorithm
+from Solid.ParallelEvaluator import HookTask
+from numpy import array, random as np_random
 
 
 class Algorithm(GeneticAlgorithm):
@@ -16,3 +22,82 @@ class Algorithm(GeneticAlgorithm):
 def test_algorithm():
     algorithm = Algorithm(.5, .7, 500, max_fitness=None)
     algorithm.run()
+
+
+class BatchAlgorithm(Algorithm):
+    """
+    Scores the whole population at once with numpy
+    """
+    def _fitness_batch(self, population):
+        return (array(population) == array([0,0,0,1,1,1])).sum(axis=1).astype(float)
+
+
+def test_fitness_batch():
+    algorithm = BatchAlgorithm(.5, .7, 500, max_fitness=None)
+    best_member, best_fitness = algorithm.run()
+    assert best_fitness == Algorithm._fitness(algorithm, best_member)
+
+
+def test_workers():
+    seed(0)
+    np_random.seed(0)
+    serial = Algorithm(.5, .7, 50, max_fitness=None).run()
+    seed(0)
+    np_random.seed(0)
+    parallel = Algorithm(.5, .7, 50, max_fitness=None).run(workers=2)
+    assert serial == parallel
+
+
+def test_take_copies_repeated_members():
+    algorithm = Algorithm(.5, .7, 500, max_fitness=None)
+    algorithm.population = algorithm._initial_population()
+    taken = algorithm._take([3, 3, 1])
+    assert taken[0] is algorithm.population[3]
+    assert taken[1] is not algorithm.population[3] and taken[1] == algorithm.population[3]
+    assert taken[2] is algorithm.population[1]
+
+
+def test_cached_workers_spawn():
+    seed(0)
+    np_random.seed(0)
+    serial = Algorithm(.5, .7, 20, max_fitness=None, cache_size=100).run()
+    seed(0)
+    np_random.seed(0)
+    with ProcessPoolExecutor(2, mp_context=get_context('spawn')) as executor:
+        parallel = Algorithm(.5, .7, 20, max_fitness=None, cache_size=100).run(executor=executor)
+    assert serial == parallel
+
+
+def test_hook_task_leaves_population():
+    algorithm = Algorithm(.5, .7, 10, max_fitness=None, cache_size=100)
+    algorithm.run()
+    task = loads(dumps(HookTask(algorithm, '_fitness')))
+    assert task.owner.population is None and len(task.owner.cache) == 0
+    assert task(algorithm.population[0]) == algorithm.fitnesses[0]
+    copied = deepcopy(algorithm)
+    assert copied.population == algorithm.population and len(copied.cache) == len(algorithm.cache)
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts fitness evaluations
+    """
+    calls = 0
+
+    def _fitness(self, member):
+        self.calls += 1
+        return Algorithm._fitness(self, member)
+
+
+def test_unmutated_list_members_keep_fitness():
+    algorithm = CountingAlgorithm(.7, 0., 10, max_fitness=None)
+    algorithm.run(verbose=False)
+    assert algorithm.calls == 50 + 10 * 35
+
+
+def test_mutation_flips_bits():
+    algorithm = Algorithm(.7, 1., 10, max_fitness=None)
+    member, changed = algorithm._mutate_tracked([1] * 6)
+    assert changed and sorted(member) == [0, 1, 1, 1, 1, 1]
+    algorithm.mutation_rate = 0.
+    assert algorithm._mutate_tracked([1] * 6) == ([1] * 6, False)
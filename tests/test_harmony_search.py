@@ -1,4 +1,7 @@
 from random import uniform
+from numpy.random import random as np_random
+from pytest import raises
+from Solid.ArrayHarmonySearch import ArrayHarmonySearch
 from Solid.HarmonySearch import HarmonySearch
 
 
@@ -16,3 +19,85 @@ class Algorithm(HarmonySearch):
 def test_algorithm():
     algorithm = Algorithm(50, .5, .3, .01, 2000, max_score=None)
     algorithm.run()
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts score evaluations
+    """
+    evaluations = 0
+
+    def _score(self, member):
+        self.evaluations += 1
+        return Algorithm._score(self, member)
+
+
+def test_scores():
+    algorithm = CountingAlgorithm(20, .9, .3, .01, 500)
+    best, best_score = algorithm.run()
+    assert algorithm.evaluations == 20 + 500
+    assert algorithm.scores == list([Algorithm._score(algorithm, x) for x in algorithm.memory])
+    assert best_score == max(algorithm.scores) == Algorithm._score(algorithm, best)
+    assert algorithm.scores[algorithm._worst_score()] == min(algorithm.scores)
+
+
+class ArrayAlgorithm(ArrayHarmonySearch):
+    """
+    Tries to get a randomly-generated array of length 1000 to all .5
+    """
+    def _random_harmony(self):
+        return np_random(1000)
+
+    def _score_batch(self, harmonies):
+        return -abs(harmonies - .5).sum(axis=1)
+
+
+def test_array_batches():
+    algorithm = ArrayAlgorithm(20, .9, .3, .01, 200, batch_size=8)
+    best, best_score = algorithm.run()
+    assert algorithm.memory.shape == (20, 1000)
+    assert abs(algorithm._score_batch(algorithm.memory) - algorithm.scores).max() < 1e-9
+    assert best_score == max(algorithm.scores) == algorithm._score_batch(best[None])[0]
+
+
+class BoundedAlgorithm(HarmonySearch):
+    """
+    Draws random components within declared bounds instead of implementing _random_harmony
+    """
+    def _score(self, member):
+        return Algorithm._score(self, member)
+
+
+class ComponentAlgorithm(Algorithm):
+    """
+    Counts random harmonies generated while improvising
+    """
+    harmonies = 0
+
+    def _random_harmony(self):
+        self.harmonies += 1
+        return Algorithm._random_harmony(self)
+
+
+def test_random_components():
+    algorithm = BoundedAlgorithm(20, .5, .3, .01, 500, bounds=[(0, 1)] * 5)
+    best, best_score = algorithm.run()
+    assert len(best) == 5 and best_score == Algorithm._score(algorithm, best)
+    algorithm = ComponentAlgorithm(20, .5, .3, .01, 500)
+    algorithm.run()
+    assert algorithm.harmonies <= 20 + 500
+    algorithm = ArrayAlgorithm(20, .9, .3, .01, 50, bounds=[(0, 1)] * 1000, batch_size=4)
+    best, best_score = algorithm.run()
+    assert best_score == max(algorithm.scores) == algorithm._score_batch(best[None])[0]
+
+
+def test_random_harmony_required():
+    with raises(TypeError):
+        BoundedAlgorithm(20, .5, .3, .01, 500)
+
+
+
+def test_memory_over_budget():
+    for algorithm in [Algorithm(50, .5, .3, .01, 2000), ArrayAlgorithm(50, .9, .3, .01, 200, batch_size=8)]:
+        with raises(ValueError):
+            algorithm.run(max_evaluations=49)
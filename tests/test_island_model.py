@@ -0,0 +1,69 @@
+from random import choice, randint, random
+from string import ascii_lowercase
+from pytest import raises
+from numpy.random import randint as np_randint
+from Solid.ArrayGeneticAlgorithm import ArrayGeneticAlgorithm
+from Solid.EvolutionaryAlgorithm import EvolutionaryAlgorithm
+from Solid.IslandModel import IslandModel
+
+
+class Algorithm(EvolutionaryAlgorithm):
+    """
+    Tries to get a randomly-generated string to match string "clout"
+    """
+    def _initial_population(self):
+        return list(''.join([choice(ascii_lowercase) for _ in range(5)]) for _ in range(50))
+
+    def _fitness(self, member):
+        return float(sum(member[i] == "clout"[i] for i in range(5)))
+
+    def _crossover(self, parent1, parent2):
+        partition = randint(0, len(self.population[0]) - 1)
+        return parent1[0:partition] + parent2[partition:]
+
+    def _mutate(self, member):
+        if self.mutation_rate >= random():
+            member = list(member)
+            member[randint(0, 4)] = choice(ascii_lowercase)
+            member = ''.join(member)
+        return member
+
+
+class ArrayAlgorithm(ArrayGeneticAlgorithm):
+    """
+    Tries to get a randomly-generated bit string of length 100 to all ones
+    """
+    def _initial_population(self):
+        return np_randint(0, 2, (50, 100))
+
+    def _fitness(self, member):
+        return float(member.sum())
+
+
+def test_algorithm():
+    for topology in ['ring', 'fully_connected']:
+        algorithm = IslandModel([Algorithm(.5, .7, 100) for _ in range(3)], 10, 2, topology=topology, seed=0)
+        best_member, best_fitness = algorithm.run()
+        assert best_fitness == Algorithm._fitness(None, best_member)
+
+
+def test_array_islands():
+    islands = [ArrayAlgorithm(.5, .7, 100, packed=True) for _ in range(2)]
+    best_member, best_fitness = IslandModel(islands, 10, 3).run()
+    assert best_fitness == best_member.sum()
+
+
+class FailingAlgorithm(Algorithm):
+    """
+    Fails to score members once it has taken a step
+    """
+    def _fitness(self, member):
+        if self.cur_steps > 0:
+            raise ValueError('boom')
+        return Algorithm._fitness(self, member)
+
+
+def test_worker_error():
+    islands = [Algorithm(.5, .7, 100), FailingAlgorithm(.5, .7, 100)]
+    with raises(ValueError, match='boom'):
+        IslandModel(islands, 10, 2).run()
@@ -0,0 +1,42 @@
+from random import choice
+from numpy import array
+from Solid.MemoCache import MemoCache
+from Solid.GeneticAlgorithm import GeneticAlgorithm
+
+
+class Algorithm(GeneticAlgorithm):
+    """
+    Tries to get a randomly-generated string to match 000111
+    """
+    def _initial_population(self):
+        return list(list([choice([0, 1]) for _ in range(6)]) for _ in range(50))
+
+    def _fitness(self, member):
+        return float(sum(member[i] == [0,0,0,1,1,1][i] for i in range(6)))
+
+
+def test_hits_and_misses():
+    cache = MemoCache(sum, 10)
+    assert cache([1, 2]) == 3
+    assert cache([1, 2]) == 3
+    assert cache(array([1, 2])) == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_eviction():
+    calls = []
+    cache = MemoCache(lambda x: calls.append(x) or x, 2)
+    cache(1)
+    cache(2)
+    cache(1)
+    cache(3)
+    assert len(cache) == 2
+    cache(1)
+    cache(2)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_algorithm():
+    algorithm = Algorithm(.5, .7, 500, max_fitness=None, cache_size=64)
+    algorithm.run()
+    assert algorithm.cache.hits > 0
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+from Solid.ParallelEvaluator import ParallelEvaluator
+
+
+def square(x):
+    return x * x
+
+
+def test_serial():
+    with ParallelEvaluator(square) as evaluator:
+        assert evaluator.map([1, 2, 3]) == [1, 4, 9]
+
+
+def test_process_pool_preserves_order():
+    with ParallelEvaluator(square, workers=2, chunk_size=3) as evaluator:
+        assert evaluator.map(list(range(20))) == [x * x for x in range(20)]
+    assert evaluator.executor is None
+
+
+def test_executor_is_not_shut_down():
+    executor = ThreadPoolExecutor(2)
+    with ParallelEvaluator(square, executor=executor) as evaluator:
+        assert evaluator.map(list(range(10))) == [x * x for x in range(10)]
+    assert executor.submit(square, 3).result() == 9
+    executor.shutdown()
@@ -0,0 +1,49 @@
+from random import uniform
+from pytest import raises
+from Solid.ParallelTempering import ParallelTempering
+from Solid.SimulatedAnnealing import SimulatedAnnealing
+from numpy import array
+
+
+class Algorithm(SimulatedAnnealing):
+    """
+    Tries to get a randomly-generated list to match [.1, .2, .3, .2, .1]
+    """
+    def _neighbor(self):
+        return list(array(self.current_state) + array([uniform(-.02, .02) for _ in range(5)]))
+
+    def _energy(self, member):
+        return sum(abs(member[i] - [.1, .2, .3, .2, .1][i]) for i in range(5))
+
+
+def test_algorithm():
+    initial_state = list([uniform(0, 1) for _ in range(5)])
+    replicas = [Algorithm(list(initial_state), t, .999, 2000) for t in [.01, .1, 1., 10.]]
+    algorithm = ParallelTempering(replicas, 50, seed=0)
+    best_state, best_energy = algorithm.run()
+    assert abs(best_energy - Algorithm._energy(None, best_state)) < 1e-9
+    assert best_energy <= Algorithm._energy(None, initial_state)
+    assert 0 < algorithm.swaps_attempted and algorithm.swaps_accepted <= algorithm.swaps_attempted
+
+
+def test_schedules():
+    replicas = [Algorithm(list([uniform(0, 1) for _ in range(5)]), t, .01, 500, schedule='linear') for t in [1., 2.]]
+    best_state, best_energy = ParallelTempering(replicas, 25).run(verbose=False)
+    assert abs(best_energy - Algorithm._energy(None, best_state)) < 1e-9
+
+
+class FailingAlgorithm(Algorithm):
+    """
+    Fails to score states once it has taken a step
+    """
+    def _energy(self, member):
+        if self.cur_steps > 0:
+            raise ValueError('boom')
+        return Algorithm._energy(self, member)
+
+
+def test_worker_error():
+    replicas = [Algorithm(list([uniform(0, 1) for _ in range(5)]), 1., .99, 500),
+                FailingAlgorithm(list([uniform(0, 1) for _ in range(5)]), 2., .99, 500)]
+    with raises(ValueError, match='boom'):
+        ParallelTempering(replicas, 25).run(verbose=False)
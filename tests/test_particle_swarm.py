@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from Solid.ParticleSwarm import ParticleSwarm
+from numpy import array, float32
+from pytest import raises
 
 
 class Algorithm(ParticleSwarm):
@@ -12,3 +15,70 @@ class Algorithm(ParticleSwarm):
 def test_algorithm():
     algorithm = Algorithm(50, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 500, min_objective=None)
     algorithm.run()
+
+
+def test_executor():
+    algorithm = Algorithm(50, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 100, min_objective=None)
+    with ThreadPoolExecutor(2) as executor:
+        algorithm.run(executor=executor)
+
+
+class BatchAlgorithm(Algorithm):
+    """
+    Scores the whole swarm at once with numpy
+    """
+    def _objective_batch(self, pos):
+        return abs(pos - array([.1, .2, .3, .2, .1])).sum(axis=1)
+
+
+def test_objective_batch_float32():
+    algorithm = BatchAlgorithm(1000, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], .5, 1., 1., 200, dtype=float32)
+    best_member, best_objective = algorithm.run()
+    assert algorithm.pos.dtype == float32 and algorithm.vel.dtype == float32
+    assert best_member.shape == (5,)
+    assert best_objective < .1
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts objective function evaluations
+    """
+    calls = 0
+
+    def _objective(self, member):
+        self.calls += 1
+        return Algorithm._objective(self, member)
+
+
+def test_each_particle_scored_once_per_step():
+    algorithm = CountingAlgorithm(20, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 50, min_objective=None)
+    best_member, best_objective = algorithm.run()
+    assert algorithm.calls == 20 * 51
+    assert best_objective == min(algorithm.best_scores)
+
+
+def test_shared_memory():
+    algorithm = Algorithm(50, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 100, min_objective=None)
+    best_member, best_objective = algorithm.run(workers=2, shared_memory=True)
+    assert best_objective == Algorithm._objective(algorithm, best_member)
+    assert algorithm.pos.shape == (50, 5)
+
+
+class FailingAlgorithm(Algorithm):
+    """
+    Fails to score any member
+    """
+    def _objective(self, member):
+        raise ValueError('boom')
+
+
+def test_shared_memory_worker_error():
+    algorithm = FailingAlgorithm(50, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 100, min_objective=None)
+    with raises(ValueError, match='boom'):
+        algorithm.run(workers=2, shared_memory=True)
+
+
+def test_swarm_over_budget():
+    algorithm = Algorithm(50, 5, [0.,0.,0.,0.,0.], [1.,1.,1.,1.,1.], 1., 2., 2., 100, min_objective=None)
+    with raises(ValueError):
+        algorithm.run(max_evaluations=49)
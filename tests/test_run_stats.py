@@ -0,0 +1,63 @@
+from random import choice, uniform
+from Solid.GeneticAlgorithm import GeneticAlgorithm
+from Solid.StochasticHillClimb import StochasticHillClimb
+
+
+class Algorithm(GeneticAlgorithm):
+    """
+    Tries to get a randomly-generated string to match 000111
+    """
+    def _initial_population(self):
+        return list(list([choice([0, 1]) for _ in range(6)]) for _ in range(50))
+
+    def _fitness(self, member):
+        return float(sum(member[i] == [0, 0, 0, 1, 1, 1][i] for i in range(6)))
+
+
+class Climb(StochasticHillClimb):
+    """
+    Tries to get a randomly-generated list to match [.1, .2, .3, .2, .1]
+    """
+    def _neighbor(self):
+        return list([x + uniform(-.02, .02) for x in self.current_state])
+
+    def _objective(self, state):
+        return -sum(abs(state[i] - [.1, .2, .3, .2, .1][i]) for i in range(5))
+
+
+def test_stats():
+    algorithm = Algorithm(.5, .7, 100, cache_size=1000)
+    algorithm.run(stats=True)
+    stats = algorithm.stats
+    assert stats.evaluations == stats.cache_misses > 0 and stats.cache_hits > 0
+    assert stats.calls['_fitness_batch'] == 101 and stats.calls['selection'] == 200
+    assert stats.evaluations_per_second() > 0 and stats.times['_fitness_batch'] <= stats.elapsed()
+    assert '_fitness' not in algorithm.__dict__ or algorithm._fitness is algorithm.cache
+
+    algorithm = Climb(list([uniform(0, 1) for _ in range(5)]), .01, 200)
+    algorithm.run(stats=True)
+    assert algorithm.stats.evaluations == 201 and algorithm.stats.calls['_neighbor'] == 200
+
+
+def test_disabled():
+    algorithm = Algorithm(.5, .7, 100)
+    algorithm.run()
+    assert algorithm.stats.evaluations is None and algorithm.stats.times == {}
+    assert algorithm.stats.cache_hits is None and algorithm.stats.elapsed() > 0
+
+
+def test_profile():
+    algorithm = Climb(list([uniform(0, 1) for _ in range(5)]), .01, 200)
+    algorithm.run(profile=True)
+    algorithm.stats.print_profile(limit=5)
+
+
+def test_hook_timed():
+    algorithm = Algorithm(.5, .7, 20)
+    algorithm.run(stats=True)
+    stats = algorithm.stats
+    assert stats.calls['_fitness'] == stats.evaluations > 0
+    algorithm = Algorithm(.5, .7, 20, cache_size=1000)
+    algorithm.run(stats=True)
+    stats = algorithm.stats
+    assert stats.calls['_fitness'] == stats.cache_hits + stats.cache_misses
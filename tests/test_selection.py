@@ -0,0 +1,39 @@
+from numpy import array
+from Solid.Selection import rank, roulette, stochastic_universal, tournament
+
+
+FITNESSES = array([0., 1., 3., 0., 6.])
+
+
+def test_roulette_skips_zero_fitness():
+    idx = roulette(FITNESSES, 1000)
+    assert len(idx) == 1000
+    assert set(idx) <= {1, 2, 4}
+
+
+def test_stochastic_universal_is_proportional():
+    idx = list(stochastic_universal(FITNESSES, 10))
+    assert (idx.count(1), idx.count(2), idx.count(4)) == (1, 3, 6)
+
+
+def test_tournament_of_whole_population_picks_best():
+    assert set(tournament(FITNESSES, 50, size=200)) == {4}
+
+
+def test_rank_handles_negative_fitness():
+    idx = rank(-FITNESSES, 1000)
+    assert set(idx) <= set(range(5))
+
+
+def test_zero_total_fitness():
+    for selection in [roulette, stochastic_universal]:
+        idx = selection([0., 0., 0.], 10)
+        assert len(idx) == 10
+        assert set(idx) <= {0, 1, 2}
+
+
+def test_negative_fitness_is_shifted():
+    for selection in [roulette, stochastic_universal]:
+        idx = selection(FITNESSES - 6., 1000)
+        assert len(idx) == 1000
+        assert set(idx) <= {1, 2, 4}
@@ -1,6 +1,10 @@
-from random import uniform
+from math import exp, log
+from random import randint, uniform
+from Solid.ArraySimulatedAnnealing import ArraySimulatedAnnealing
 from Solid.SimulatedAnnealing import SimulatedAnnealing
 from numpy import array
+from numpy.random import uniform as np_uniform
+from pytest import raises
 
 
 class Algorithm(SimulatedAnnealing):
@@ -17,3 +21,111 @@ class Algorithm(SimulatedAnnealing):
 def test_algorithm():
     algorithm = Algorithm(list([uniform(0, 1) for _ in range(5)]), 5, .99, 5000)
     algorithm.run()
+
+
+class MoveAlgorithm(Algorithm):
+    """
+    Nudges one component of the current list in place per step
+    """
+    def _propose_move(self):
+        return randint(0, 4), uniform(-.02, .02)
+
+    def _apply_move(self, move):
+        self.current_state[move[0]] += move[1]
+
+    def _undo_move(self, move):
+        self.current_state[move[0]] -= move[1]
+
+
+class DeltaAlgorithm(MoveAlgorithm):
+    """
+    Computes the energy change of a move from the one component it changes
+    """
+    def _delta_energy(self, move):
+        i, step = move
+        x = self.current_state[i]
+        return abs(x + step - [.1, .2, .3, .2, .1][i]) - abs(x - [.1, .2, .3, .2, .1][i])
+
+
+def test_moves():
+    for cls in [MoveAlgorithm, DeltaAlgorithm]:
+        initial_state = list([uniform(0, 1) for _ in range(5)])
+        algorithm = cls(list(initial_state), 5, .99, 5000, moves=True)
+        best_state, best_energy = algorithm.run()
+        assert abs(best_energy - Algorithm._energy(algorithm, best_state)) < 1e-9
+        assert abs(algorithm.current_energy - Algorithm._energy(algorithm, algorithm.current_state)) < 1e-9
+        assert algorithm.initial_state == initial_state
+
+
+class IrreversibleAlgorithm(Algorithm):
+    """
+    Applies moves it cannot undo
+    """
+    _propose_move = MoveAlgorithm._propose_move
+    _apply_move = MoveAlgorithm._apply_move
+
+
+class IncrementalAlgorithm(IrreversibleAlgorithm):
+    """
+    Computes energy changes incrementally, so never needs to undo a move
+    """
+    _delta_energy = DeltaAlgorithm._delta_energy
+
+
+def test_moves_require_hooks():
+    with raises(ValueError):
+        Algorithm([.5] * 5, 5, .99, 100, moves=True)
+    with raises(ValueError):
+        IrreversibleAlgorithm([.5] * 5, 5, .99, 100, moves=True)
+    IncrementalAlgorithm([.5] * 5, 5, .99, 100, moves=True).run(verbose=False)
+
+
+class ArrayAlgorithm(ArraySimulatedAnnealing):
+    """
+    Anneals 200 chains at once towards [.1, .2, .3, .2, .1]
+    """
+    def _neighbor_batch(self):
+        return self.current_state + np_uniform(-.02, .02, self.current_state.shape)
+
+    def _energy_batch(self, states):
+        return abs(states - array([.1, .2, .3, .2, .1])).sum(axis=1)
+
+
+def test_array_chains():
+    initial_state = np_uniform(0, 1, (200, 5))
+    algorithm = ArrayAlgorithm(initial_state, 5, .99, 1000)
+    best_state, best_energy = algorithm.run()
+    assert algorithm.best_energies.shape == (200,)
+    assert (algorithm.best_energies <= algorithm._energy_batch(initial_state)).all()
+    assert abs(algorithm._energy_batch(algorithm.best_states) - algorithm.best_energies).max() < 1e-9
+    assert best_energy == algorithm.best_energies.min()
+    assert abs(algorithm._energy_batch(algorithm.current_state) - algorithm.current_energy).max() < 1e-9
+
+
+def test_schedules():
+    for schedule, constant in [('lundy_mees', .01), ('logarithmic', 5.), ('adaptive', .999)]:
+        algorithm = Algorithm(list([uniform(0, 1) for _ in range(5)]), 'auto', constant, 2000,
+                              schedule=schedule, reheat_steps=300)
+        best_state, best_energy = algorithm.run()
+        assert algorithm.start_temp > 0
+        assert best_energy == Algorithm._energy(algorithm, best_state)
+    algorithm = ArrayAlgorithm(np_uniform(0, 1, (50, 5)), 'auto', .999, 500, schedule='adaptive', reheat_steps=100)
+    best_state, best_energy = algorithm.run()
+    assert algorithm.start_temp > 0 and 0 <= algorithm.acceptance_rate <= 1
+
+
+def test_reheat():
+    algorithm = Algorithm([.5] * 5, 2., 5., 100, schedule='logarithmic', reheat_steps=10)
+    algorithm._clear()
+    algorithm.current_temp = .5
+    algorithm.reheat_temp = .8
+    algorithm._reheat()
+    assert algorithm.current_temp == .8
+    algorithm.adjust_temp()
+    steps = exp((2. / .8 - 1) / 5.) - 1
+    assert abs(algorithm.current_temp - 2. / (1 + 5. * log(2 + steps))) < 1e-12
+    algorithm.reheat_temp = .1
+    algorithm.stagnant_steps = 10
+    temp = algorithm.current_temp
+    algorithm.adjust_temp()
+    assert algorithm.current_temp == temp and algorithm.stagnant_steps == 0
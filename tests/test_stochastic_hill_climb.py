@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from random import uniform
 from Solid.StochasticHillClimb import StochasticHillClimb
 from numpy import array
@@ -17,3 +18,52 @@ class Algorithm(StochasticHillClimb):
 def test_algorithm():
     algorithm = Algorithm(list([uniform(0, 1) for _ in range(5)]), .01, 1000)
     algorithm.run()
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts objective evaluations of a climb with a negative objective
+    """
+    evaluations = 0
+
+    def _objective(self, state):
+        self.evaluations += 1
+        return -1. / Algorithm._objective(self, state)
+
+
+def test_negative_objective():
+    algorithm = CountingAlgorithm(list([uniform(0, 1) for _ in range(5)]), .01, 500)
+    best_state, best_objective = algorithm.run()
+    assert algorithm.evaluations == 501
+    assert best_state is not None and best_objective == -1. / Algorithm._objective(algorithm, best_state)
+
+
+def test_multi_start():
+    initial_states = list([list([uniform(0, 1) for _ in range(5)]) for _ in range(4)])
+    for workers in [None, 2]:
+        algorithm = Algorithm(initial_states[0], .01, 500)
+        best_state, best_objective = algorithm.run_multi_start(initial_states, workers=workers)
+        assert best_objective == Algorithm._objective(algorithm, best_state)
+        assert algorithm.initial_state is initial_states[0]
+
+
+class RecordingAlgorithm(Algorithm):
+    """
+    Records the number of steps each climb took
+    """
+    steps = []
+
+    def run(self, verbose=True, max_evaluations=None, time_limit=None, stats=False, profile=False):
+        res = Algorithm.run(self, verbose, max_evaluations, time_limit, stats, profile)
+        self.steps.append(self.cur_steps)
+        return res
+
+
+def test_multi_start_threads():
+    initial_states = list([list([uniform(0, 1) for _ in range(5)]) for _ in range(4)])
+    algorithm = RecordingAlgorithm(initial_states[0], .01, 300)
+    with ThreadPoolExecutor(4) as executor:
+        best_state, best_objective = algorithm.run_multi_start(initial_states, executor=executor)
+    assert sorted(RecordingAlgorithm.steps) == [300] * 4
+    assert best_objective == Algorithm._objective(algorithm, best_state)
+    assert algorithm.current_state is None and algorithm.initial_state is initial_states[0]
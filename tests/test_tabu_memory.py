@@ -0,0 +1,30 @@
+from numpy import array
+from Solid.TabuMemory import TabuMemory
+
+
+def test_fifo_eviction():
+    memory = TabuMemory(2)
+    memory.append('a')
+    memory.append('b')
+    memory.append('a')
+    assert 'a' in memory and 'b' in memory
+    memory.append('c')
+    assert 'a' in memory and 'b' not in memory
+    memory.append('d')
+    assert 'a' not in memory and len(memory) == 2
+
+
+def test_unhashable_states():
+    memory = TabuMemory(5)
+    memory.append([1, 2])
+    memory.append(array([3., 4.]))
+    assert [1, 2] in memory
+    assert array([3., 4.]) in memory
+    assert [2, 1] not in memory
+
+
+def test_fingerprint():
+    memory = TabuMemory(5, key=lambda x: hash(tuple(x)))
+    memory.append([1, 2])
+    assert list(memory) == [hash((1, 2))]
+    assert [1, 2] in memory
@@ -1,4 +1,6 @@
-from random import choice, randint, random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from random import choice, randint, random, seed
 from string import ascii_lowercase
 from Solid.TabuSearch import TabuSearch
 from copy import deepcopy
@@ -25,3 +27,98 @@ class Algorithm(TabuSearch):
 def test_algorithm():
     algorithm = Algorithm('abcde', 50, 500, max_score=None)
     algorithm.run()
+
+
+def test_copy_strategy():
+    algorithm = Algorithm('abcde', 50, 500, max_score=None, copy='none')
+    algorithm.run()
+
+
+def test_fingerprint():
+    algorithm = Algorithm('abcde', 5000, 500, max_score=None, fingerprint=True)
+    algorithm.run()
+    assert all([isinstance(x, int) for x in algorithm.tabu_list])
+
+
+class CountingAlgorithm(Algorithm):
+    """
+    Counts score evaluations
+    """
+    calls = 0
+
+    def _score(self, state):
+        self.calls += 1
+        return Algorithm._score(self, state)
+
+
+def test_neighborhood_scored_once():
+    algorithm = CountingAlgorithm('abcde', 50, 100, max_score=None)
+    algorithm.run()
+    assert algorithm.calls <= 1 + 10 * algorithm.cur_steps
+    assert algorithm.best_score == Algorithm._score(algorithm, algorithm.best)
+
+
+def test_workers():
+    seed(0)
+    serial = Algorithm('abcde', 50, 100, max_score=None).run()
+    seed(0)
+    parallel = Algorithm('abcde', 50, 100, max_score=None).run(workers=2)
+    assert serial == parallel
+
+
+def test_cached_workers_spawn():
+    seed(0)
+    serial = Algorithm('abcde', 50, 30, max_score=None, cache_size=100).run()
+    seed(0)
+    with ProcessPoolExecutor(2, mp_context=get_context('spawn')) as executor:
+        parallel = Algorithm('abcde', 50, 30, max_score=None, cache_size=100).run(executor=executor)
+        algorithm = Algorithm('abcde', 50, 30, max_score=None, cache_size=100)
+        best, best_score = algorithm.run(executor=executor, max_evaluations=200)
+    assert serial == parallel
+    assert algorithm.budget.evaluations <= 200 and best_score == Algorithm._score(algorithm, best)
+
+
+class LazyAlgorithm(CountingAlgorithm):
+    """
+    Yields an unbounded stream of random neighbors
+    """
+    def _neighborhood(self):
+        member = list(self.current)
+        while True:
+            neighbor = deepcopy(member)
+            neighbor[randint(0, 4)] = choice(ascii_lowercase)
+            yield ''.join(neighbor)
+
+
+def test_first_improvement():
+    algorithm = CountingAlgorithm('abcde', 50, 200, max_score=None, candidates='first_improvement')
+    algorithm.run()
+    assert algorithm.best_score == Algorithm._score(algorithm, algorithm.best)
+
+
+def test_sample_from_generator():
+    algorithm = LazyAlgorithm('abcde', 50, 100, max_score=None, candidates='sample', sample_size=5)
+    algorithm.run()
+    assert algorithm.calls == 1 + 5 * 100
+
+
+class OrderedAlgorithm(CountingAlgorithm):
+    """
+    Yields every single character substitution in order
+    """
+    def _neighborhood(self):
+        for i in range(5):
+            for c in ascii_lowercase:
+                yield self.current[:i] + c + self.current[i + 1:]
+
+    def _neighborhood_size(self):
+        return 5 * len(ascii_lowercase)
+
+
+def test_sample_from_ordered_generator():
+    algorithm = OrderedAlgorithm('abcde', 50, 100, max_score=None, candidates='sample', sample_size=10)
+    algorithm.current = 'abcde'
+    sampled = algorithm._sample(algorithm._neighborhood())
+    assert len(sampled) == 10 and any([x[0] == 'a' for x in sampled])
+    algorithm.run()
+    assert algorithm.calls == 1 + 10 * 100